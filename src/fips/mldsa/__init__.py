@@ -3,9 +3,19 @@ from .default_parameters import (
     MLDSA_192,
     MLDSA_256,
 )
+from .cache import MatrixCache
+from .poly import Poly, PolyVec, PolyMatrix, StreamedMatrix, SparsePoly, COEFFICIENT_DOMAIN, NTT_DOMAIN
 
 __all__ = [
     "MLDSA_128",
     "MLDSA_192",
     "MLDSA_256",
+    "MatrixCache",
+    "Poly",
+    "PolyVec",
+    "PolyMatrix",
+    "StreamedMatrix",
+    "SparsePoly",
+    "COEFFICIENT_DOMAIN",
+    "NTT_DOMAIN",
 ]
@@ -0,0 +1,107 @@
+import sys
+import threading
+from collections import OrderedDict
+
+class MatrixCache:
+    """
+    A size-bounded LRU cache of expanded public matrices A, keyed by the seed rho.
+
+    ExpandA costs k*l SHAKE128 calls and rejection samplings, and only depends on rho and
+    the dimensions, so a cache attached to an MLDSA instance removes it from every sign and
+    verify with a key it has already seen. The cache holds at most max_bytes of matrices
+    (measured with sys.getsizeof) and evicts the least recently used ones first.
+
+    One cache can be shared by several threads and several MLDSA instances, the dimensions
+    are part of the key. The cached matrices are shared by every caller and must not be
+    modified.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Args:
+            max_bytes (int): the byte budget of the cached matrices.
+        Raises:
+            ValueError: If max_bytes is not a positive integer.
+        """
+        if not isinstance(max_bytes, int) or max_bytes < 1:
+            raise ValueError(f"max_bytes must be a positive integer, got {max_bytes!r}")
+
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict() # (rho, k, l) -> (matrix, size), least recently used first.
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _size(matrix: list) -> int:
+        """
+        Returns the number of bytes held by a matrix of polynomials.
+        """
+        return sys.getsizeof(matrix) + sum(
+            sys.getsizeof(row) + sum(sys.getsizeof(poly) for poly in row) for row in matrix
+        )
+
+    def get(self, rho: bytes, k: int, l: int, expand):
+        """
+        Returns the matrix expanded from rho, from the cache or by calling expand(rho) and
+        caching the result. expand runs outside the lock, so concurrent misses on the same
+        rho may both expand it.
+        Args:
+            rho (bytes): the public seed.
+            k (int): number of rows of the matrix.
+            l (int): number of columns of the matrix.
+            expand (callable): expand(rho) returns the k x l matrix.
+        Returns:
+            A (PolyMatrix): the expanded matrix, shared with other callers.
+        """
+        key = (bytes(rho), k, l)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        matrix = expand(rho)
+        size = self._size(matrix)
+
+        with self._lock:
+            if key in self._entries or size > self.max_bytes:
+                return matrix
+            self._entries[key] = (matrix, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+        return matrix
+
+    def clear(self):
+        """
+        Empties the cache, the counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the counters and the current occupancy of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
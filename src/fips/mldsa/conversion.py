@@ -1,10 +1,36 @@
 import hashlib
+from functools import lru_cache
+
+from .poly import Poly
+
+# int.bit_count is only available from Python 3.10.
+_popcount = getattr(int, "bit_count", None) or (lambda x: bin(x).count("1"))
+
+@lru_cache(maxsize=256)
+def _absorbed_shake_256(prefix: bytes):
+    """
+    Returns a SHAKE256 state that has absorbed prefix, shared by every caller with the same
+    prefix. It is only ever copied, never updated or squeezed itself.
+    """
+    return hashlib.shake_256(prefix)
+
+@lru_cache(maxsize=256)
+def _absorbed_public_key(public_key: bytes, prefix: bytes):
+    """
+    Returns a SHAKE256 state that has absorbed tr || prefix with tr = H(public_key, 64), so
+    H(public_key) and the prefix are only hashed the first time a (key, prefix) pair is seen.
+    It is only ever copied, never updated or squeezed itself.
+    """
+    return hashlib.shake_256(hashlib.shake_256(public_key).digest(64) + prefix)
 
 class Conversion:
-    def __init__(self):
+    def __init__(self, validate: bool = True):
         self.N = 256 # fixed for all
         self.q = 8380417 # fixed for all
 
+        # when False the per-element input scans are skipped, for callers that only pass internal values.
+        self.validate = validate
+
     def H(self, input_bytestring: bytes, output_bytestring_length: int) -> bytes:
         """
         Implementation the H(str, l) hashing using SHAKE256.
@@ -29,6 +55,60 @@ class Conversion:
         # 3. Request the final hash with the desired length
         return shake.digest(output_bytestring_length)   
 
+    def H_prefixed(self, prefix: bytes, input_bytestring: bytes, output_bytestring_length: int) -> bytes:
+        """
+        Computes H(prefix || input_bytestring, l) without concatenating the two.
+
+        The state after absorbing prefix is kept in a bounded cache shared by all instances, so
+        a prefix that repeats (tr || 0 || len(ctx) || ctx for the same key and context) is
+        absorbed once and every call copies that state and only absorbs input_bytestring.
+        Args:
+            prefix (bytes): The bytestring hashed first, used as the cache key.
+            input_bytestring (bytes): The bytestring hashed after prefix.
+            output_bytestring_length (int): The desired length of the output hash in bytes.
+        Returns:
+            Output (bytes): The resulting hash as a byte string.
+        Raises:
+            TypeError: If prefix or input is not a bytes object.
+        """
+        if not isinstance(prefix, (bytes, bytearray)):
+            raise TypeError("Prefix must be a bytes or bytearray object.")
+        if not isinstance(input_bytestring, (bytes, bytearray)):
+            raise TypeError("Input must be a bytes or bytearray object.")
+
+        shake = _absorbed_shake_256(bytes(prefix)).copy()
+        shake.update(input_bytestring)
+        return shake.digest(output_bytestring_length)
+
+    def H_public_key_prefixed(self, public_key: bytes, prefix: bytes, input_bytestring: bytes,
+                              output_bytestring_length: int) -> bytes:
+        """
+        Computes H(H(public_key, 64) || prefix || input_bytestring, l), the message representative
+        of verification with tr = H(public_key, 64).
+
+        The state after absorbing tr || prefix is cached by (public_key, prefix), so for a key and
+        context seen before neither tr nor the prefix is hashed again, only input_bytestring.
+        Args:
+            public_key (bytes): The public key tr is computed from.
+            prefix (bytes): The bytestring hashed after tr.
+            input_bytestring (bytes): The bytestring hashed after prefix.
+            output_bytestring_length (int): The desired length of the output hash in bytes.
+        Returns:
+            Output (bytes): The resulting hash as a byte string.
+        Raises:
+            TypeError: If public_key, prefix or input is not a bytes object.
+        """
+        if not isinstance(public_key, (bytes, bytearray)):
+            raise TypeError("Public key must be a bytes or bytearray object.")
+        if not isinstance(prefix, (bytes, bytearray)):
+            raise TypeError("Prefix must be a bytes or bytearray object.")
+        if not isinstance(input_bytestring, (bytes, bytearray)):
+            raise TypeError("Input must be a bytes or bytearray object.")
+
+        shake = _absorbed_public_key(bytes(public_key), bytes(prefix)).copy()
+        shake.update(input_bytestring)
+        return shake.digest(output_bytestring_length)
+
     def bytes_to_bits(self, z: bytes) -> str:
         """
         Converts a byte string z into a bit string in little-endian order.
@@ -68,16 +148,17 @@ class Conversion:
             TypeError: If y is not a string or alpha is not an integer.
         """
         # Input validation
-        if not isinstance(y, str):
-            raise TypeError("Input y must be a string.")
-        if not isinstance(alpha, int):
-            raise TypeError("Input alpha must be an integer.")
-        if alpha <= 0:
-            raise ValueError("alpha must be a positive integer.")
-        if len(y) != alpha:
-            raise ValueError(f"Bit string y must have exactly {alpha} bits.")
-        if any(bit not in "01" for bit in y):
-            raise ValueError("Bit string y must contain only '0' and '1' characters.")
+        if self.validate:
+            if not isinstance(y, str):
+                raise TypeError("Input y must be a string.")
+            if not isinstance(alpha, int):
+                raise TypeError("Input alpha must be an integer.")
+            if alpha <= 0:
+                raise ValueError("alpha must be a positive integer.")
+            if len(y) != alpha:
+                raise ValueError(f"Bit string y must have exactly {alpha} bits.")
+            if any(bit not in "01" for bit in y):
+                raise ValueError("Bit string y must contain only '0' and '1' characters.")
 
         x = 0
         for i in range(1, alpha + 1):
@@ -104,14 +185,15 @@ class Conversion:
         """
 
         # input check
-        if not isinstance(x, int) or not isinstance(alpha, int):
-            raise TypeError("Both x and alpha must be integers.")
-        if x < 0:
-            raise ValueError("x must be non-negative.")
-        if alpha <= 0:
-            raise ValueError("alpha must be a positive integer.")
-        if x >= 2 ** alpha:
-            raise ValueError(f"x = {x} cannot be represented in {alpha} bits.")
+        if self.validate:
+            if not isinstance(x, int) or not isinstance(alpha, int):
+                raise TypeError("Both x and alpha must be integers.")
+            if x < 0:
+                raise ValueError("x must be non-negative.")
+            if alpha <= 0:
+                raise ValueError("alpha must be a positive integer.")
+            if x >= 2 ** alpha:
+                raise ValueError(f"x = {x} cannot be represented in {alpha} bits.")
         
         x_mod = x
         bits = []
@@ -137,7 +219,7 @@ class Conversion:
         """
         if not isinstance(y, str):
             raise TypeError("Input y must be a string.")
-        if any(bit not in "01" for bit in y):
+        if self.validate and any(bit not in "01" for bit in y):
             raise ValueError("Bit string y must contain only '0' and '1'.")
 
         alpha = len(y)
@@ -216,7 +298,7 @@ class Conversion:
             return _reduce_single_int(z)
         elif isinstance(z[0], int):
             return [_reduce_single_int(p) for p in z]
-        elif isinstance(z[0], list):
+        elif isinstance(z[0], (list, Poly)):
             return [[_reduce_single_int(p) for p in z[k]] for k in range(len(z))]
         else:
             raise TypeError("Input z must be an integer or a list of integers or a list of list of integers.")
@@ -232,9 +314,10 @@ class Conversion:
         # checking input type
         if not isinstance(z, list):
             raise TypeError("Input z must be a list of integers.")
-        for p in z:
-            if not isinstance(p, int):
-                raise TypeError("All elements in the list z must be integers.")
+        if self.validate:
+            for p in z:
+                if not isinstance(p, int):
+                    raise TypeError("All elements in the list z must be integers.")
 
         for p in range (len(z)):
             z[p] = abs(z[p])
@@ -255,12 +338,13 @@ class Conversion:
         """
         if not isinstance(z, list):
             raise TypeError("Input z must be a list.")
-        for sublist in z:
-            if not isinstance(sublist, list):
-                raise TypeError("Input z must be a list of lists of integers.")
-            for p in sublist:
-                if not isinstance(p, int):
-                    raise TypeError("All elements in the list z must be integers.")
+        if self.validate:
+            for sublist in z:
+                if not isinstance(sublist, (list, Poly)):
+                    raise TypeError("Input z must be a list of lists of integers.")
+                for p in sublist:
+                    if not isinstance(p, int):
+                        raise TypeError("All elements in the list z must be integers.")
 
         max_value = 0
 
@@ -272,29 +356,33 @@ class Conversion:
     
     def calc_ones(self, h: list) -> int:
         """
-        a helper function to calculate the number of 1s inside a list[ list [ int ] ].
+        a helper function to calculate the number of 1s inside a hint vector.
         Args:
-            h (list): A 2D list containing 0s and 1s.
+            h (list): A list of hint polynomials, each a bitset int or a list containing 0s and 1s.
         Returns:
-            int: The count of 1s in the 2D list.
+            int: The count of 1s in the hint vector.
         Raises:
-            TypeError: If h is not a list of lists of integers.
+            TypeError: If h is not a list of bitsets or of lists of integers.
             TypeError: If any element in the sublists is not an integer.
             TypeError: If elements of h[x] are not 0 or 1.
         """
         if not isinstance(h, list):
             raise TypeError("Input h must be a list.")
-        for sublist in h:
-            if not isinstance(sublist, list):
-                raise TypeError("Input h must be a list of lists of integers.")
-            for p in sublist:
-                if not isinstance(p, int) and p not in (0, 1):
-                    raise TypeError("All elements in the list h must be integers.")
+        if self.validate:
+            for sublist in h:
+                if isinstance(sublist, int):
+                    continue
+                if not isinstance(sublist, list):
+                    raise TypeError("Input h must be a list of lists of integers.")
+                for p in sublist:
+                    if not isinstance(p, int) and p not in (0, 1):
+                        raise TypeError("All elements in the list h must be integers.")
         count = 0
-        for i in range(len(h)):
-            for j in range(len(h[i])):
-                if h[i][j] == 1:
-                    count = count + 1
+        for poly in h:
+            if isinstance(poly, int):
+                count = count + _popcount(poly)
+            else:
+                count = count + sum(1 for bit in poly if bit == 1)
 
         return count
     
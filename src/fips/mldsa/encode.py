@@ -1,7 +1,8 @@
 from .packing import Packing
+from .poly import PolyVec
 
 class Encode:
-    def __init__(self, eta, k, l, gamma1, gamma2, omega, _lambda_):
+    def __init__(self, eta, k, l, gamma1, gamma2, omega, _lambda_, validate: bool = True):
         self.d = 13 # fixed for all
         self.N = 256 # fixed for all
         self.q = 8380417 # fixed for all
@@ -14,7 +15,7 @@ class Encode:
         self.omega = omega
         self._lambda_ = _lambda_
 
-        self.packing = Packing(self.omega, self.k)
+        self.packing = Packing(self.omega, self.k, validate)
 
     def pk_encode(self, rho: bytes, t1_vec: list) -> bytes:
         """
@@ -155,7 +156,7 @@ class Encode:
         for i in range(int(t0_len / 416)):
             t0_vec[i] = self.packing.bit_unpack(t0_bytes[i * 416 : (i + 1) * 416], pow(2, self.d - 1) - 1, pow(2, self.d - 1))
 
-        return rho, K_seed, tr, s1, s2, t0_vec
+        return rho, K_seed, tr, PolyVec(s1), PolyVec(s2), PolyVec(t0_vec)
     
     def w1_encode(self, w:list):
         """
@@ -244,7 +245,7 @@ class Encode:
                 raise ValueError("Each unpacked polynomial must have 256 coefficients.")
             t1.append(coeffs)
 
-        return rho, t1
+        return rho, PolyVec(t1)
 
     def sig_decode(self, signature: bytes):
         """
@@ -277,5 +278,5 @@ class Encode:
         
         h = self.packing.hint_bit_unpack(y)
 
-        return (c_tilda, z, h)
+        return (c_tilda, PolyVec(z), h)
     
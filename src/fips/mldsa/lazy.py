@@ -0,0 +1,160 @@
+from functools import partial
+from operator import add, sub, mul, neg
+
+from .poly import Poly, PolyVec, COEFFICIENT_DOMAIN
+
+class LazyVector:
+    """
+    A vector of polynomials expression in Zq that is only evaluated when it is observed.
+
+    Arithmetic (+, -, unary -, * by an integer) and elementwise functions (map) only record
+    the operation: every row of the expression is a chain of map iterators over the rows of
+    the operand vectors. Observing the expression (evaluate, rows, infinity_norm) runs the
+    whole chain in one pass per coefficient, so intermediates are never stored.
+
+    Arithmetic results are integers congruent mod q and are reduced into [0, q - 1] when
+    they are evaluated or passed to a mapped function. The values returned by a mapped
+    function are kept exactly as returned.
+    """
+    __slots__ = ("q", "domain", "length", "exact", "_row")
+
+    def __init__(self, q: int, length: int, row, domain: str = COEFFICIENT_DOMAIN, exact: bool = False):
+        """
+        Args:
+            q (int): the modulus.
+            length (int): number of polynomials of the vector.
+            row (callable): row(i) returns an iterable over the coefficients of polynomial i.
+            domain (str): the domain the vector is in.
+            exact (bool): whether the coefficients are exact values rather than classes mod q.
+        """
+        self.q = q
+        self.length = length
+        self._row = row
+        self.domain = domain
+        self.exact = exact
+
+    @classmethod
+    def of(cls, vector: list, q: int) -> "LazyVector":
+        """
+        Wraps a vector of polynomials (list of lists of ints) without copying it.
+        """
+        if isinstance(vector, LazyVector):
+            return vector
+        if not isinstance(vector, (list, tuple)):
+            raise TypeError(f"Expected a list or tuple, got {type(vector).__name__}")
+        domain = vector.domain if isinstance(vector, PolyVec) else COEFFICIENT_DOMAIN
+        return cls(q, len(vector), vector.__getitem__, domain)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def _operand(self, other) -> "LazyVector":
+        """
+        Returns other as a LazyVector compatible with this one.
+        """
+        other = LazyVector.of(other, self.q)
+        if other.length != self.length:
+            raise ValueError("Both vectors must have the same length.")
+        if other.q != self.q:
+            raise ValueError("Both vectors must use the same modulus.")
+        if other.domain != self.domain:
+            raise ValueError(f"Cannot combine a vector in the {self.domain} domain with one in the {other.domain} domain.")
+        return other
+
+    def _combine(self, operation, other) -> "LazyVector":
+        other = self._operand(other)
+        left = self._row
+        right = other._row
+        return LazyVector(self.q, self.length, lambda i: map(operation, left(i), right(i)), self.domain)
+
+    def __add__(self, other) -> "LazyVector":
+        return self._combine(add, other)
+
+    def __sub__(self, other) -> "LazyVector":
+        return self._combine(sub, other)
+
+    def __neg__(self) -> "LazyVector":
+        row = self._row
+        return LazyVector(self.q, self.length, lambda i: map(neg, row(i)), self.domain)
+
+    def __mul__(self, scalar: int) -> "LazyVector":
+        if not isinstance(scalar, int):
+            return NotImplemented
+        row = self._row
+        scale = partial(mul, scalar)
+        return LazyVector(self.q, self.length, lambda i: map(scale, row(i)), self.domain)
+
+    __rmul__ = __mul__
+
+    def _reduced_row(self, i: int):
+        """
+        Returns an iterator over the coefficients of polynomial i, reduced into [0, q - 1]
+        unless they are exact values.
+        """
+        if self.exact:
+            return iter(self._row(i))
+        return map(self.q.__rmod__, self._row(i))
+
+    def map(self, function, *others) -> "LazyVector":
+        """
+        Applies function coefficient-wise, function(x, *ys) is called with the reduced
+        coefficients of this vector and of every vector of others at the same position.
+        Args:
+            function (callable): function of 1 + len(others) integers.
+            others (LazyVector or list): vectors of the same length and domain.
+        Returns:
+            result (LazyVector): the expression of the exact values returned by function.
+        """
+        operands = [self] + [self._operand(other) for other in others]
+        return LazyVector(
+            self.q, self.length,
+            lambda i: map(function, *[operand._reduced_row(i) for operand in operands]),
+            self.domain, exact=True,
+        )
+
+    def rows(self):
+        """
+        Yields every polynomial of the evaluated expression as a list of ints.
+        """
+        for i in range(self.length):
+            yield list(self._reduced_row(i))
+
+    def evaluate(self, out: list = None) -> list:
+        """
+        Evaluates the expression.
+        Args:
+            out (list): optional vector of polynomials (PolyVec or list of lists) the result
+                is written into instead of a new PolyVec. It may be one of the operands.
+        Returns:
+            result (PolyVec): the evaluated vector, tagged with the domain of the expression.
+        """
+        if out is None:
+            return PolyVec(self.rows(), self.domain)
+        if len(out) != self.length:
+            raise ValueError(f"Expected an output vector of {self.length} polynomials, got {len(out)}")
+        # each coefficient is written as soon as it is computed, no row is stored in between.
+        for i, o in enumerate(out):
+            if isinstance(o, Poly):
+                o.assign(self._reduced_row(i))
+            else:
+                o[:] = self._reduced_row(i)
+        if isinstance(out, PolyVec):
+            out.domain = self.domain
+        return out
+
+    def infinity_norm(self) -> int:
+        """
+        Returns the largest absolute value of the centered coefficients (mod± q) of the
+        expression, computed in the same pass that evaluates it.
+        """
+        return max((self.row_infinity_norm(i) for i in range(self.length)), default=0)
+
+    def row_infinity_norm(self, i: int) -> int:
+        """
+        Returns the infinity norm of polynomial i of the expression alone. The rows of the
+        operands are only read now, so a caller can fill them one polynomial at a time and
+        check each as soon as it is written.
+        """
+        q = self.q
+        half_q = (q - 1) // 2
+        return max(abs((x + half_q) % q - half_q) for x in self._row(i))
@@ -1,13 +1,56 @@
+import os
 import secrets
+from collections import deque
+from functools import partial
 
 from .conversion import Conversion
 from .sample import Sample
 from .ntt import NTT
 from .encode import Encode
 from .operation import Operations
+from .scratch import SignScratch
+from .poly import PolyVec
 
 class MLDSA:
-    def __init__(self, default_parameters: dict):
+    def __init__(self, default_parameters: dict, sparse_challenge: bool = True, validation: str = "full",
+                 sign_executor = None, sign_candidates: int = None, matrix_cache = None,
+                 expand_executor = None, low_memory: bool = False):
+        """
+        Args:
+            default_parameters (dict): one of the parameter sets of DEFAULT_PARAMETERS.
+            sparse_challenge (bool): multiply by the challenge c with signed rotations instead of the NTT.
+            validation (str): "full" checks the inputs of every internal primitive on every call,
+                "boundary" checks them only at the public ml_dsa_* entry points and runs the
+                internal primitives without their per-coefficient checks.
+            sign_executor (concurrent.futures.Executor): optional pool on which signing evaluates
+                several consecutive kappa candidates of the rejection loop at once. The signature is
+                the one of the lowest accepted kappa, identical to sequential signing. A process pool
+                gives real parallelism, a thread pool only overlaps the parts that release the GIL
+                (hashing, numpy). The executor is owned and shut down by the caller.
+            sign_candidates (int): number of kappa candidates in flight with sign_executor, the
+                number of CPUs by default.
+            matrix_cache (MatrixCache): optional cache of the matrices A expanded from rho, which
+                removes ExpandA from key generation, signing and verification with a known key. It
+                may be shared between threads and instances.
+            expand_executor (concurrent.futures.Executor): optional pool on which ExpandA samples the
+                k*l polynomials of A as independent jobs, for the keys that are not cached. Its number
+                of workers sets the parallelism, as with sign_executor a process pool is needed for
+                real parallelism. The executor is owned and shut down by the caller.
+            low_memory (bool): never store the matrix A, generate its rows one at a time while they
+                are multiplied, so at most one row is alive. Signing generates A again for every
+                iteration of its rejection loop. Cannot be combined with matrix_cache or expand_executor.
+        Raises:
+            ValueError: If validation is not "full" or "boundary".
+            ValueError: If sign_candidates is not a positive integer.
+            ValueError: If low_memory is combined with matrix_cache or expand_executor.
+        """
+        if validation not in ("full", "boundary"):
+            raise ValueError(f"validation must be 'full' or 'boundary', got {validation!r}")
+        if sign_candidates is not None and (not isinstance(sign_candidates, int) or sign_candidates < 1):
+            raise ValueError(f"sign_candidates must be a positive integer, got {sign_candidates!r}")
+        if low_memory and (matrix_cache is not None or expand_executor is not None):
+            raise ValueError("low_memory cannot be combined with matrix_cache or expand_executor.")
+
         self.q = default_parameters["q"]
         self.d = default_parameters["d"]
         self.N = default_parameters["N"]
@@ -23,11 +66,29 @@ class MLDSA:
         
         self.beta = self.tau * self.eta
 
-        self.convert = Conversion()
-        self.sample = Sample(self.eta, self.gamma1, self.k, self.l, self._lambda_, self.tau, self.omega) 
-        self.ntt = NTT()
-        self.encode = Encode(self.eta, self.k, self.l, self.gamma1, self.gamma2, self.omega, self._lambda_)
-        self.operation = Operations(self.gamma2)
+        # compute the products with the challenge c by signed rotations instead of the NTT.
+        self.sparse_challenge = sparse_challenge
+
+        # speculative evaluation of the rejection loop, sequential when there is no executor.
+        self.sign_executor = sign_executor
+        self.sign_candidates = sign_candidates or os.cpu_count() or 1
+
+        # expanded matrices A by rho, ExpandA runs on every call when there is no cache.
+        self.matrix_cache = matrix_cache
+        self.expand_executor = expand_executor
+
+        # A is streamed row by row into the products instead of being stored.
+        self.low_memory = low_memory
+
+        # the entry points always validate, the components only in "full" mode.
+        self.validation = validation
+        validate = validation == "full"
+
+        self.convert = Conversion(validate)
+        self.sample = Sample(self.eta, self.gamma1, self.k, self.l, self._lambda_, self.tau, self.omega, validate) 
+        self.ntt = NTT(validate=validate)
+        self.encode = Encode(self.eta, self.k, self.l, self.gamma1, self.gamma2, self.omega, self._lambda_, validate)
+        self.operation = Operations(self.gamma2, validate)
 
         self.ZETAS = [
         0, 4808194, 3765607, 3761513, 5178923, 5496691, 5234739, 5178987, 
@@ -90,20 +151,18 @@ class MLDSA:
         K_seed = Hash_result[96:]       # c. Get K_seed:            The last 32 bytes
 
         # line 3: generate the matrix A (k x l) and store polynomials as list of coefficients.
-        A_hat = self.sample.expand_A(rho)
+        A_hat = self._expand_A(rho)
 
         # line 4: generate and store s1 and s2 polynomial vectors.
         s1, s2 = self.sample.expand_S(rho_prime)
 
         # line 5 compute vector t as 'A.s1 + s2'. 
-            # a. Transform s₁ into the NTT domain
-        s1_ntt = [self.ntt.NTT(p) for p in s1] 
-            # b. Compute the matrix-vector product Â ◦ NTT(s₁)
-        product_A_s1_ntt = self.ntt.multiply_matrix_vector(A_hat, s1_ntt)
-            # c. Transform the result back from the NTT domain
-        product_A_s1 = [self.ntt.inv_NTT(p) for p in product_A_s1_ntt]
-            # d. Add the second secret vector s₂
-        t_vec = [self.ntt.AddNTT(product_A_s1[i], s2[i]) for i in range(self.k)]
+            # a. Compute the matrix-vector product Â ◦ NTT(s₁), s₁ is transformed inside the product.
+        product_A_s1_ntt = self.ntt.multiply_matrix_vector(A_hat, s1)
+            # b. Transform the result back from the NTT domain
+        product_A_s1 = self.ntt.to_coefficients(product_A_s1_ntt)
+            # c. Add the second secret vector s₂ in the coefficient domain, so s₂ is never transformed.
+        t_vec = self.ntt.AddPolynomialVectors(product_A_s1, s2)
 
         # line 6: decompose t into (t1, t0) such that r = (r1.2^d + r0) mod q
         t1_vector, t0_vector = self.ntt.power2round_vec(t_vec)
@@ -142,7 +201,7 @@ class MLDSA:
         # 5: return ML-DSA.KeyGen_internal(ξ)
         return self.ml_dsa_keygen_internal(random_32_byte_seed)
 
-    def ml_dsa_sign_internal(self, private_key: bytes, Message: bytes, input_seed):
+    def ml_dsa_sign_internal(self, private_key: bytes, Message: bytes, input_seed, message_prefix: bytes = b""):
         """
         Algorithm 7 FIPS 204
         
@@ -151,6 +210,9 @@ class MLDSA:
             private_key (bytes): The private key bytestring.
             Message (bitstring): The message to be signed in bits.
             input_seed (bytes): A 32-byte random seed for signature generation.
+            message_prefix (bytes): bytes that precede Message in M', M' = message_prefix || Message.
+                The SHAKE256 state after tr || message_prefix is cached, so a prefix that repeats
+                (0 || len(ctx) || ctx in ml_dsa_sign) is only absorbed once.
         Returns:
             signature (bytes): The generated ML-DSA signature as a bytestring.
         Raises:
@@ -174,111 +236,202 @@ class MLDSA:
         # line 1: breaking the private key into 6 sub bytestrings.
         rho, K_seed, tr, s1_vec, s2_vec, t0_vec = self.encode.sk_decode(private_key)
 
-        # line 2 to 4: performing polynomial wise NTT conversion.
-        s1_ntt = [self.ntt.NTT(p) for p in s1_vec]
-        s2_ntt = [self.ntt.NTT(p) for p in s2_vec]
-        t0_ntt = [self.ntt.NTT(p) for p in t0_vec]
+        # line 2 to 4: performing polynomial wise NTT conversion (not needed by the sparse challenge products).
+        # t0 is only used by iterations that pass the z and r0 checks, its transform waits for the first one.
+        if self.sparse_challenge:
+            key = (s1_vec, s2_vec, t0_vec, None)
+        else:
+            key = (self.ntt.to_ntt(s1_vec), self.ntt.to_ntt(s2_vec), t0_vec, [])
 
         # line 5: sample a k x l matrix from input seed rho.
-        A_hat = self.sample.expand_A(rho)
+        A_hat = self._expand_A(rho)
 
-        # line 6: hash the message after concatenating it after tr with shake 256 into a 64-bytes bytestring.
-        mew = self.convert.H(tr + Message, 64)
+        # line 6: hash the message after tr with shake 256 into a 64-bytes bytestring, from the state
+        # that has already absorbed tr || message_prefix.
+        mew = self.convert.H_prefixed(tr + message_prefix, Message, 64)
         
         # line 7: compute a private random seed by hashing (K + input random seed + mew) with shake 256 into a 64-byte bytestring.
         rho_prime_prime = self.convert.H(K_seed + input_seed + mew, 64)
 
-        # line 8 and 9: initialize kappa, z and H.
+        # line 8 to 10 and 31: the rejection sampling loop, from kappa = 0 in steps of l.
+        if self.sign_executor is not None:
+            return self._sign_speculative(A_hat, mew, rho_prime_prime, key)
+
         kappa = 0
-        z = None
-        h = None
+        sigma = None
+        while sigma is None:
+            sigma = self._sign_iteration(A_hat, mew, rho_prime_prime, key, kappa)
+            kappa = kappa + self.l
 
-        # line 10: rejection sampling loop.
-        while z == None and h == None:
+        return sigma
 
-            # line 11: generate a vector of l polynomials using private random seed.
-            y = self.sample.expand_mask(rho_prime_prime, kappa)
+    def _sign_iteration(self, A_hat: list, mew: bytes, rho_prime_prime: bytes, key: tuple, kappa: int):
+        """
+        Lines 11 to 30 and 33 of Algorithm 7 FIPS 204 for one value of kappa.
 
-            # line 12: create a vector of k polynomials by multiplying A and y in NTT domain.
-            y_ntt = [self.ntt.NTT(p) for p in y] # apply the NTT conversion on copy of vector y.
-            
-            # compute: A . NTT(y)
-            product_A_y = self.ntt.multiply_matrix_vector(A_hat, y_ntt)
-            
-            # return A . NTT(y) back to polynomial form.
-            w = [self.ntt.inv_NTT(p) for p in product_A_y] # NTT inverse function applied on the temporary the temporary vector.
+        An iteration only depends on its inputs and kappa, so iterations for different values
+        of kappa can run concurrently, each thread writes into its own scratch arena.
+        Args:
+            A_hat (list): the matrix A in NTT domain, a PolyMatrix or a StreamedMatrix.
+            mew (bytes): the message representative.
+            rho_prime_prime (bytes): the private random seed.
+            key (tuple): (s1, s2, t0, t0_ntt), s1 and s2 in NTT domain unless the challenge is sparse,
+                t0 in coefficient domain and t0_ntt a list caching NTT(t0) (None for the sparse challenge).
+            kappa (int): the counter of the candidate.
+        Returns:
+            signature (bytes): the encoded signature, or None if the candidate is rejected.
+        """
+        s1, s2, t0, t0_ntt = key
 
-            # line 13 and 14: component wise conversion to high bits.
-            w_1 = [[self.operation.highBits(w[i][j]) for j in range (self.N)] for i in range (self.k)]
+        # every iteration writes its intermediate vectors into the same preallocated buffers.
+        scratch = SignScratch.for_thread(self.k, self.l)
 
-            # line 15: encode the vector polynomial w_1 into a byte string and hash it after concatenating it after mew into a bytestring of size lambda / 4 using shake 256. 
-            c_tilda = self.convert.H(mew + self.encode.w1_encode(w_1), int(self._lambda_ / 4))
+        # line 11: generate a vector of l polynomials using private random seed.
+        y = self.sample.expand_mask(rho_prime_prime, kappa)
 
-            # line 16: takes an input seed rho of length lambda / 4 and converts it into a polynomial c.
-            c = self.sample.SampleInBall(c_tilda)
+        # line 12: create a vector of k polynomials by multiplying A and y in NTT domain.
+        y_ntt = self.ntt.NTT_vec(y, out=scratch.y_ntt)
 
-            # line 17: convert polynomial c into NTT domain.
-            c_ntt  = self.ntt.NTT(c) # apply the NTT conversion on copy of polynomial c.
+        # compute: A . NTT(y)
+        product_A_y = self.ntt.multiply_matrix_vector(A_hat, y_ntt, out=scratch.w)
+        
+        # return A . NTT(y) back to polynomial form, in place.
+        w = self.ntt.inv_NTT_vec(product_A_y, out=product_A_y)
 
-            # line 18: multiply polynomial c_ntt [256] with vector s1 [l][256] int NTT domain and apply NTT inverse.
-            product_c_s1_ntt = self.ntt.multiply_polynomial_vector(c_ntt, s1_ntt)
+        # line 13 and 14: component wise conversion to high bits. w is decomposed once into (w1, w0),
+        # the low bits are all that is left of w afterwards so they are written over it.
+        w_1, w_0 = self.operation.decompose_vec(w, out=(scratch.w_1, w))
 
-            # take product_c_s1 back to polynomial form.
-            product_c_s1 = [self.ntt.inv_NTT(p) for p in product_c_s1_ntt] # NTT inverse function applied on temporary vector.
+        # line 15: encode the vector polynomial w_1 into a byte string and hash it after concatenating it after mew into a bytestring of size lambda / 4 using shake 256. 
+        c_tilda = self.convert.H(mew + self.encode.w1_encode(w_1), int(self._lambda_ / 4))
 
-            # line 19: multiply polynomial c_ntt [256] with vector s2 [k][256] in NTT domain and apply NTT inverse.
-            product_c_s2_ntt = self.ntt.multiply_polynomial_vector(c_ntt, s2_ntt)
+        # line 16: takes an input seed rho of length lambda / 4 and converts it into a polynomial c.
+        # c_sparse holds the positions and signs of the tau nonzero coefficients of c.
+        c, c_sparse = self.sample.challenge(c_tilda)
 
-            # return product_c_s2 back to polynomial form. 
-            product_c_s2 = [self.ntt.inv_NTT(p) for p in product_c_s2_ntt] # NTT inverse function applied on temporary vector.
+        # line 17: convert polynomial c into NTT domain, the sparse challenge is used as it is.
+        c_ntt = None if self.sparse_challenge else self.ntt.NTT(c)
 
-            # line 20: sum of 2 vectors of polynomials.
-            z = self.ntt.AddPolynomialVectors(y, product_c_s1)
+        # line 18 and 20: z = y + c.s1 is only evaluated when the signature is accepted, its polynomials are read
+        # from the scratch buffer, so each one is checked (line 23) as soon as its c.s1 is written.
+        z_expression = self.ntt.lazy(y) + self.ntt.lazy(scratch.product_c_s1)
+        rejected = self._exceeds(z_expression, self._challenge_products(c_sparse, c_ntt, s1, scratch.product_c_s1), self.gamma1 - self.beta)
 
-            neg_product_c_s2 = self.ntt.multiply_scalar_vector(-1, product_c_s2)
-            sum_w_neg_product_c_s2 = self.ntt.AddPolynomialVectors(w, neg_product_c_s2)
+        # line 19, 21 and 22: LowBits(w - c.s2) is w0 - c.s2 whenever ||w0 - c.s2|| < gamma2 - beta, and when it
+        # is not, both fail the norm check. c.s2 is only computed once z passed, and checked the same way.
+        r0 = self.ntt.lazy(w_0) - self.ntt.lazy(scratch.product_c_s2)
+        rejected = rejected or self._exceeds(r0, self._challenge_products(c_sparse, c_ntt, s2, scratch.product_c_s2), self.gamma2 - self.beta)
 
-            # line 21 and 22: component wise conversion to high bits after taking difference of vector w and vector cs2.
-            r0 = self.operation.lowBits_vector(sum_w_neg_product_c_s2)
+        # line 24: it's literally just an "else" statement.
+        if not rejected:
 
-            # line 23: check l infinity norm for z and r0 
-            if ((self.convert.infinity_norm(z) >= self.gamma1 - self.beta) or (self.convert.infinity_norm(r0) >= self.gamma2 - self.beta)): # main rejection loop terminates for else case here.
-                z = None
-                h = None
+            if self.sparse_challenge:
+                # line 25: multiply c with vector t0 [k][256] by signed rotations.
+                product_c_t0 = self.ntt.sparse_multiply_vector(c_sparse, t0, out=scratch.product_c_t0)
 
-            # line 24: it's literally just an "else" statement.
             else:
+                if not t0_ntt:
+                    t0_ntt.append(self.ntt.to_ntt(t0))
 
                 # line 25: multiply polynomial c_ntt [256] with vector t0 [k][256] int NTT domain and apply NTT inverse.
-                product_c_t0_ntt = self.ntt.multiply_polynomial_vector(c_ntt, t0_ntt)
-
-                # return back to polynomial form.
-                product_c_t0 = [self.ntt.inv_NTT(p) for p in product_c_t0_ntt] # NTT inverse function applied on temporary vector.
-
-                # line 26 and 27: apply make hint componentwise everywehre to obtain vector binary polynomial h.
-                neg_product_c_t0 = self.ntt.multiply_scalar_vector(-1, product_c_t0)
-
-                sum_w_neg_product_c_s2_product_c_t0 = self.ntt.AddPolynomialVectors(sum_w_neg_product_c_s2, product_c_t0)
-                
-                # ! ##########################################
-                h = [[0] * self.N for _ in range(self.k)] # initialize the empty vector.
-                for i in range(self.k):
-                    for j in range(self.N):
-                        h[i][j] = self.operation.make_hint(neg_product_c_t0[i][j], sum_w_neg_product_c_s2_product_c_t0[i][j])
-                        # print(h)
-                # # line 28: reject if any of the 2 conditions is true.
-                if (self.convert.infinity_norm(product_c_t0) >= self.gamma2 or self.convert.calc_ones(h) > self.omega):
-                    z = None
-                    h = None
-
-            # line 31: increment counter        
-            kappa = kappa + self.l
-            
-        # line 33: 
-        sigma = self.encode.sig_encode(c_tilda, self.convert.centered_modulus(z), h)
-        
-        return sigma
+                product_c_t0_ntt = self.ntt.multiply_polynomial_vector(c_ntt, t0_ntt[0], out=scratch.product_c_t0)
+
+                # return back to polynomial form, in place.
+                product_c_t0 = self.ntt.inv_NTT_vec(product_c_t0_ntt, out=product_c_t0_ntt)
+
+            # line 28 (first condition): reject when ||c.t0|| >= gamma2 before any hint is computed.
+            if self.ntt.lazy(product_c_t0).infinity_norm() < self.gamma2:
+
+                # line 26 and 27: apply make hint componentwise everywehre to obtain vector binary polynomial h,
+                # MakeHint(-c.t0, w - c.s2 + c.t0) is read off w0 - c.s2 + c.t0 and w1 with integer comparisons,
+                # h holds one bitset per polynomial.
+                h = self.operation.make_hint_low_bits_vec((r0 + self.ntt.lazy(product_c_t0)).rows(), w_1)
+
+                # line 28 (second condition): reject if there are more than omega hints.
+                if self.convert.calc_ones(h) <= self.omega:
+                    z = z_expression.evaluate(out=scratch.z)
+
+                    # line 33: encoded right away, so the scratch buffers can be reused by the next iteration.
+                    return self.encode.sig_encode(c_tilda, self.convert.centered_modulus(z), h)
+
+        return None
+
+    def __getstate__(self):
+        # the executor stays with the instance that owns it, a pickled copy (such as the one a process
+        # pool receives with every candidate) evaluates its candidates sequentially. The matrix cache
+        # holds a lock and stays too, the candidates receive A_hat already expanded.
+        state = self.__dict__.copy()
+        state["sign_executor"] = None
+        state["expand_executor"] = None
+        state["matrix_cache"] = None
+        return state
+
+    def _expand_A(self, rho: bytes) -> list:
+        """
+        Returns the matrix A expanded from rho, through matrix_cache when there is one and on
+        expand_executor when there is one. A cached matrix is shared and is only read. In
+        low_memory mode A is a StreamedMatrix.
+        """
+        if self.low_memory:
+            return self.sample.expand_A_streamed(rho)
+        expand = partial(self.sample.expand_A, executor=self.expand_executor)
+        if self.matrix_cache is None:
+            return expand(rho)
+        return self.matrix_cache.get(rho, self.k, self.l, expand)
+
+    def _sign_speculative(self, A_hat: list, mew: bytes, rho_prime_prime: bytes, key: tuple) -> bytes:
+        """
+        Runs the rejection sampling loop with sign_candidates consecutive values of kappa in flight
+        on sign_executor, and returns the signature of the lowest kappa that is accepted, which is
+        the signature the sequential loop returns.
+
+        The candidates are collected in increasing kappa order, every rejected one is replaced by the
+        next kappa so that the executor stays busy, and the candidates still in flight are cancelled
+        once a signature is found.
+        """
+        pending = deque()
+        kappa = 0
+        try:
+            while True:
+                while len(pending) < self.sign_candidates:
+                    pending.append(self.sign_executor.submit(self._sign_iteration, A_hat, mew, rho_prime_prime, key, kappa))
+                    kappa = kappa + self.l
+                sigma = pending.popleft().result()
+                if sigma is not None:
+                    return sigma
+        finally:
+            for future in pending:
+                future.cancel()
+
     
+    def _challenge_products(self, c: list, c_ntt: list, vector: list, out: PolyVec):
+        """
+        Yields the polynomials of c.vector in the coefficient domain one at a time, each written into the
+        polynomial of out at the same position, so that a caller can stop as soon as one is rejected.
+        Args:
+            c (list or SparsePoly): the challenge polynomial.
+            c_ntt (list): NTT(c), or None to multiply by signed rotations (vector in coefficient domain).
+            vector (list): the vector of polynomials, in NTT domain when c_ntt is given.
+            out (PolyVec): the vector the products are written into.
+        """
+        for i, poly in enumerate(vector):
+            if c_ntt is None:
+                yield self.ntt.sparse_multiply(c, poly, out=out[i])
+            else:
+                yield self.ntt.inv_NTT(self.ntt.MultiplyNTT(c_ntt, poly), out=out[i])
+
+    @staticmethod
+    def _exceeds(expression, products, bound: int) -> bool:
+        """
+        Computes the products one polynomial at a time and returns True as soon as the polynomial of
+        expression at the same position has an infinity norm of at least bound, leaving the remaining
+        products uncomputed.
+        """
+        for i, _ in enumerate(products):
+            if expression.row_infinity_norm(i) >= bound:
+                return True
+        return False
+
     def ml_dsa_sign(self, private_key: bytes, Message, ctx:bytes) -> bytes:
         """
         Algorithm 2 FIPS 204
@@ -315,13 +468,14 @@ class MLDSA:
             # return none and error indication.
             print(f"Error: Failed to generate random seed. {e}")
             return None
-        Message_modified = self.convert.integer_to_bytes(0, 1) + self.convert.integer_to_bytes(len(ctx), 1) + ctx + Message
+        # M' = 0 || len(ctx) || ctx || M, the message itself is absorbed after the cached prefix.
+        message_prefix = self.convert.integer_to_bytes(0, 1) + self.convert.integer_to_bytes(len(ctx), 1) + ctx
 
-        rho = self.ml_dsa_sign_internal(private_key, Message_modified, random_32_byte_seed)
+        rho = self.ml_dsa_sign_internal(private_key, Message, random_32_byte_seed, message_prefix)
 
         return rho
 
-    def ml_dsa_verify_internal(self, public_key: bytes, message, signature: bytes) -> bool:
+    def ml_dsa_verify_internal(self, public_key: bytes, message, signature: bytes, message_prefix: bytes = b"") -> bool:
         """
         Algorithm 8 FIPS 204
 
@@ -330,6 +484,8 @@ class MLDSA:
             public_key (bytes): The public key bytestring.
             message (bitstring): The message in bits.
             signature (bytes): The signature bytestring.
+            message_prefix (bytes): bytes that precede message in M', M' = message_prefix || message,
+                absorbed, with tr = H(public_key, 64), once per distinct (public_key, message_prefix).
         Returns:
             result (bool): True if the signature is valid, False otherwise.
         Raises:
@@ -353,45 +509,34 @@ class MLDSA:
         if (h == None): 
             return False
         
-        A_hat = self.sample.expand_A(rho)
+        A_hat = self._expand_A(rho)
 
-        tr = self.convert.H(public_key, 64)
+        # tr = H(public_key, 64) and tr || message_prefix are only hashed for a (key, prefix) pair not
+        # seen before. tr || message_prefix is a whole number of bytes, so the message bits pack on their own.
+        mew = self.convert.H_public_key_prefixed(public_key, message_prefix, self.convert.bits_to_bytes(message), 64)
 
-        mew = self.convert.H(self.convert.bits_to_bytes(self.convert.bytes_to_bits(tr) + message), 64)
+        c, c_sparse = self.sample.challenge(c_tilda)
 
-        c = self.sample.SampleInBall(c_tilda)
+        # compute the matrix-vector product Â ◦ NTT(z), z is transformed inside the product.
+        product_ntt = self.ntt.multiply_matrix_vector(A_hat, z)
 
-        # a. Transform s₁ into the NTT domain
-        z_ntt = [self.ntt.NTT(p) for p in z] 
-            # b. Compute the matrix-vector product Â ◦ NTT(s₁)
-        product_ntt = [[0] * self.N for _ in range(self.k)] # initialize product of A_cap and NTT(s1)
-        for i in range(self.k):
-            for j in range(self.l):
-                temprary_list = self.ntt.MultiplyNTT(A_hat[i][j], z_ntt[j])
-                for k in range(self.N):
-                    product_ntt[i][k] = (product_ntt[i][k] + temprary_list[k]) % self.q
+        if self.sparse_challenge:
+            # c.t1.2^d by signed rotations of t1, subtracted after A.z is back in polynomial form.
+            product_A_z = self.ntt.to_coefficients(product_ntt)
+            product_c_t1 = self.ntt.multiply_scalar_vector(pow(2, self.d), self.ntt.sparse_multiply_vector(c_sparse, t1))
 
-        c_ntt = self.ntt.NTT(c)
-        d_on_pow_2 = [pow(2,self.d) for _ in range(self.N)]
+        else:
+            # scale c by 2^d before its transform, NTT(c.2^d) = NTT(c).2^d, then multiply with NTT(t1).
+            c_ntt = self.ntt.NTT([x * pow(2, self.d) for x in c])
+            product_c_t1 = self.ntt.multiply_polynomial_vector(c_ntt, t1)
 
-        scalar_multiple = self.ntt.MultiplyNTT(c_ntt, d_on_pow_2)
-        
-        t1_ntt = [self.ntt.NTT(p) for p in t1] 
+            # the difference is taken in NTT domain so that only one inverse transform is needed.
+            product_A_z = product_ntt
 
-        product_2 = [[0 for _ in range(self.N)] for _ in range(self.k)]
-        for i in range(len(t1)):
-            product_2[i] = self.ntt.MultiplyNTT(scalar_multiple, t1_ntt[i])
+        w_approx = self.ntt.to_coefficients(self.ntt.SubPolynomialVectors(product_A_z, product_c_t1))
+
+        w1 = self.operation.use_hint_vec(h, w_approx)
 
-        w_approx = [[0 for _ in range(self.N)] for _ in range(self.k)]
-        
-        for i in range(self.k):
-            w_approx[i] = self.ntt.inv_NTT(self.ntt.SubNTT(product_ntt[i], product_2[i]))
-
-        w1 = [[0 for _ in range(self.N)] for _ in range(self.k)]
-        for i in range(self.k):
-            for j in range(self.N):
-                w1[i][j] = self.operation.use_hint(h[i][j], w_approx[i][j])
-            
         c_hash_encoded = self.convert.H(mew + self.encode.w1_encode(w1), int(self._lambda_ / 4))
         
         return (self.convert.infinity_norm(z) < (self.gamma1 - self.beta)) and (c_hash_encoded == c_tilda)
@@ -427,7 +572,8 @@ class MLDSA:
         if len(ctx) > 255:
                 raise ValueError(f"ctx bytes must have length at most 255, ctx has length {len(ctx) = }")
 
-        Message_modified = self.convert.bytes_to_bits(self.convert.integer_to_bytes(0, 1) + self.convert.integer_to_bytes(len(ctx), 1) + ctx) + message
+        # M' = 0 || len(ctx) || ctx || M, the message itself is absorbed after the cached prefix.
+        message_prefix = self.convert.integer_to_bytes(0, 1) + self.convert.integer_to_bytes(len(ctx), 1) + ctx
         
-        return self.ml_dsa_verify_internal(public_key, Message_modified, signature)
+        return self.ml_dsa_verify_internal(public_key, message, signature, message_prefix)
     
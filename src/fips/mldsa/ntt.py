@@ -1,10 +1,48 @@
-import math
+import sys
+from array import array
+from functools import partial
+from itertools import islice
+from operator import add, sub, mul
+
+from .poly import Poly, PolyVec, StreamedMatrix, SparsePoly, COEFFICIENT_DOMAIN, NTT_DOMAIN
+from .lazy import LazyVector
+
+try:
+    import numpy as np
+except ImportError: # numpy is an optional dependency.
+    np = None
+
+def _pack_lanes(coefficients, typecode: str = "I") -> int:
+    """
+    Packs non-negative coefficients into one integer, with coefficient i in lane i of
+    the array typecode width ("I": 32 bits, "Q": 64 bits).
+    """
+    lanes = array(typecode, coefficients)
+    if sys.byteorder == "big":
+        lanes.byteswap()
+    return int.from_bytes(lanes.tobytes(), "little")
+
+def _unpack_lanes(value: int, count: int, typecode: str = "I") -> array:
+    """
+    Reverses _pack_lanes, returning the first count lanes of value as an array.
+    """
+    lanes = array(typecode)
+    lanes.frombytes(value.to_bytes(lanes.itemsize * count, "little"))
+    if sys.byteorder == "big":
+        lanes.byteswap()
+    return lanes
 
 class NTT:
-    def __init__(self):
+    def __init__(self, use_numpy: bool = True, radix: int = 4, validate: bool = True):
+        if radix not in (2, 4):
+            raise ValueError(f"radix must be 2 or 4, got {radix}")
+
         self.N = 256 # fixed for all
         self.q = 8380417 # fixed for all
         self.d = 13 # fixed for all
+
+        # when False the per-coefficient input scans are skipped, for callers that only pass internal values.
+        self.validate = validate
         self.ZETAS = [
         0, 4808194, 3765607, 3761513, 5178923, 5496691, 5234739, 5178987, 
         7778734, 3542485, 2682288, 2129892, 3764867, 7375178, 557458, 7159240, 
@@ -39,32 +77,74 @@ class NTT:
         6195333, 3123762, 2358373, 6187330, 5365997, 6663603, 2926054, 7987710, 
         8077412, 3531229, 4405932, 4606686, 1900052, 7598542, 1054478, 7648983]
 
-    def NTT (self, coefficient_list) -> list:
+        self.N_INV = 8347681 # modular inverse of 256 in Zq
+
+        # precomputed twiddles for inv_NTT: ZETAS_INV[m] = -ZETAS[m] mod q.
+        self.ZETAS_INV = [(self.q - zeta) % self.q for zeta in self.ZETAS]
+
+        # the last inverse layer (m = 1) has 256^-1 folded into its twiddle.
+        self.ZETA_INV_LAST = (self.ZETAS_INV[1] * self.N_INV) % self.q
+
+        # radix 4 runs two butterfly layers per pass over the coefficients.
+        self.radix = radix
+
+        # twiddle triplets per pass and block for the radix 4 transforms, the passes are
+        # the layer pairs (128, 64), (32, 16), (8, 4), (2, 1) and the reverse for inv_NTT.
+        self.RADIX4_ZETAS = []
+        self.RADIX4_ZETAS_INV = []
+        for length in (64, 16, 4, 1):
+            blocks = self.N // (4 * length)
+            self.RADIX4_ZETAS.append((length, [
+                (self.ZETAS[blocks + b], self.ZETAS[2 * blocks + 2 * b], self.ZETAS[2 * blocks + 2 * b + 1])
+                for b in range(blocks)
+            ]))
+        for length in (1, 4, 16, 64):
+            blocks = self.N // (4 * length)
+            self.RADIX4_ZETAS_INV.append((length, [
+                (self.ZETAS_INV[4 * blocks - 1 - 2 * b], self.ZETAS_INV[4 * blocks - 2 - 2 * b], self.ZETAS_INV[2 * blocks - 1 - b])
+                for b in range(blocks)
+            ]))
+
+        # batched transforms run on numpy when it is installed and not disabled.
+        self.use_numpy = use_numpy and np is not None
+        if self.use_numpy:
+            self.ZETAS_NP = np.array(self.ZETAS, dtype=np.int64)
+            self.ZETAS_INV_NP = np.array(self.ZETAS_INV, dtype=np.int64)
+
+    def NTT (self, coefficient_list, out: Poly = None) -> list:
         """
         Algorithm 41 FIPS 204
 
         Computes the ntt of a polynomial.
         Args:
             coefficient_list (list): list of integers representing polynomial coefficients.
+            out (Poly): optional polynomial the result is written into instead of a new one,
+                it may be coefficient_list itself.
         Returns:
-            w_hat (list): list of integers representing NTT transformed polynomial coefficients.
+            w_hat (Poly): list of integers representing NTT transformed polynomial coefficients.
         Raises:
             TypeError: If the input is not a list or tuple, or if any coefficient is not an integer.
             ValueError: If the input list does not contain exactly 256 elements.
         """
 
         # --- Input checks ---
-        if not isinstance(coefficient_list, (list, tuple)):
+        if not isinstance(coefficient_list, (list, tuple, Poly)):
             raise TypeError(f"Expected a list or tuple, got {type(coefficient_list).__name__}")
 
         if len(coefficient_list) != self.N:
             raise ValueError(f"Expected 256 elements, got {len(coefficient_list)}")
 
-        if not all(isinstance(x, (int, float)) for x in coefficient_list):
+        # a Poly only holds integers, only other sequences are scanned.
+        if self.validate and not isinstance(coefficient_list, Poly) and not all(isinstance(x, (int, float)) for x in coefficient_list):
             raise TypeError("All coefficients of the polynomial must be integers.")
+
+        if self.radix == 4:
+            return self._result(self._NTT_radix4(coefficient_list), out)
         
-        # line 1 to 5: initialize w_hat, m and len. 
-        w_hat = [coefficient_list[i] for i in range (self.N)] # make a copy of the input so that it remains unchanged.
+        # line 1 to 5: initialize w_hat, m and len.
+        w_hat = list(coefficient_list) # make a copy of the input so that it remains unchanged.
+        q = self.q
+        zetas = self.ZETAS
         m = 0
         length = 128
 
@@ -77,22 +157,23 @@ class NTT:
                 m = m + 1
 
                 # line 10: assign zetas value to z where zetas are precomputed.
-                z= self.ZETAS[m] 
+                z = zetas[m]
 
-                # line 11 to 15: butterfly operation. 
+                # line 11 to 15: butterfly operation. only the product is reduced, the sums
+                # stay unreduced (they grow by at most q per layer) until the final pass.
                 for j in range(start, start + length):
-                    t = (z * w_hat[j + length]) % self.q
-                    w_hat[j + length] = (w_hat[j] - t) % self.q
-                    w_hat[j] = (w_hat[j] + t) % self.q
-                
+                    t = (z * w_hat[j + length]) % q
+                    w_hat[j + length] = w_hat[j] - t
+                    w_hat[j] = w_hat[j] + t
+
                 # line 16: increment 'start' by left shifted 'length'.
                 start = start + 2 * length
-            
+
             # line 18: update length. ( 128 -> 64 -> 32 -> 16 -> 8 -> 4 -> 2 -> 1 )
-            length = math.floor(length/2)
-        
-        # line 20: return w_hat 
-        return w_hat
+            length = length // 2
+
+        # line 20: return w_hat after a single normalization into [0, q - 1], done as it is written.
+        return self._result(map(q.__rmod__, w_hat), out)
 
     def MultiplyNTT(self, vec_a: list, vec_b: list) -> list:
         """
@@ -103,14 +184,14 @@ class NTT:
             vec_a (list): list of integers representing polynomial coefficients in ntt domain.
             vec_b (list): list of integers representing polynomial coefficients in ntt domain.
         Returns:
-            c (list): list of integers representing NTT multiplied polynomial coefficients.
+            c (Poly): list of integers representing NTT multiplied polynomial coefficients.
         Raises:
             TypeError: If the inputs are not lists or tuples.
             ValueError: If the input lists are not of equal size.
         """
-        if not isinstance(vec_a, (list, tuple)):
+        if not isinstance(vec_a, (list, tuple, Poly)):
             raise TypeError(f"Expected a list or tuple for vec_a, got {type(vec_a)}")
-        if not isinstance(vec_b, (list, tuple)):
+        if not isinstance(vec_b, (list, tuple, Poly)):
             raise TypeError(f"Expected a list or tuple for vec_b, got {type(vec_b)}")
         if len(vec_a) != len(vec_b):
             raise ValueError(f"both lists must be of equal size to perform NTT multiplication.")
@@ -120,53 +201,374 @@ class NTT:
         for i in range(self.N):
             c[i] = (vec_a[i] * vec_b[i]) % self.q
 
-        return c
+        return Poly(c)
     
-    def inv_NTT(self, coefficient_list: list) -> list:
+    def inv_NTT(self, coefficient_list: list, out: Poly = None) -> list:
         """
         Algorithm 42 FIPS 204
 
         Computes the inverse ntt of a polynomial vector.
         Args:
             coefficient_list (list): list of integers representing polynomial coefficients in ntt domain.
+            out (Poly): optional polynomial the result is written into instead of a new one,
+                it may be coefficient_list itself.
         Returns:
-            w (list): list of integers representing polynomial coefficients.
+            w (Poly): list of integers representing polynomial coefficients.
         Raises:
             TypeError: If the input is not a list or tuple, or if any coefficient is not an integer.
             ValueError: If the input list does not contain exactly 256 elements.
         """
         # input checks
-        if not isinstance(coefficient_list, (list, tuple)):
+        if not isinstance(coefficient_list, (list, tuple, Poly)):
             raise TypeError(f"Expected a list or tuple, got {type(coefficient_list).__name__}")
-        if not all(isinstance(x, (int, float)) for x in coefficient_list):
+        if self.validate and not isinstance(coefficient_list, Poly) and not all(isinstance(x, (int, float)) for x in coefficient_list):
             raise TypeError("All coefficients of the polynomial must be integers.")
         if len(coefficient_list) != self.N:
             raise ValueError(f"Input list must have exactly {self.N} coefficients.")
+
+        if self.radix == 4:
+            return self._result(self._inv_NTT_radix4(coefficient_list), out)
         
+        w = list(coefficient_list) # make a copy of the input so that it remains unchanged.
+        q = self.q
+        zetas_inv = self.ZETAS_INV
         m = 256
         length = 1
 
-        while length < 256:
+        # layers 1 to 7: the sums are left unreduced, only the twiddle products are reduced.
+        while length < 128:
             start = 0
             while start < 256:
                 m = m - 1
-                z = (-1 * self.ZETAS[m] + self.q) % self.q
+                z = zetas_inv[m] # precomputed -ZETAS[m] mod q
                 for j in range (start, start + length):
-                    t = coefficient_list[j]
-                    coefficient_list[j] = (t + coefficient_list[j + length]) % self.q
-                    coefficient_list[j + length] = (t - coefficient_list[j + length]) % self.q
-                    coefficient_list[j + length] = (z * coefficient_list[j + length]) % self.q
+                    t = w[j]
+                    u = w[j + length]
+                    w[j] = t + u
+                    w[j + length] = (z * (t - u)) % q
 
                 start = start + 2 * length
 
             length = 2 * length
 
-        f = 8347681 # modular inverse of 256 in Zq
-        for j in range (self.N):
-            coefficient_list[j] = (coefficient_list[j] * f) % self.q
+        # last layer (m = 1) with the multiplication by 256^-1 merged into it.
+        f = self.N_INV
+        z = self.ZETA_INV_LAST
+        for j in range (128):
+            t = w[j]
+            u = w[j + 128]
+            w[j] = ((t + u) * f) % q
+            w[j + 128] = (z * (t - u)) % q
 
-        return coefficient_list
+        return self._result(w, out)
     
+    def _NTT_radix4(self, coefficient_list: list) -> list:
+        """
+        Computes the same transform as NTT, merging each pair of butterfly layers
+        (lengths 2L and L) into one pass over blocks of 4L coefficients.
+        Args:
+            coefficient_list (list): list of 256 integers representing polynomial coefficients.
+        Returns:
+            w_hat (iterator): the NTT transformed polynomial coefficients, reduced into [0, q - 1]
+                as they are read.
+        """
+        w = list(coefficient_list)
+        q = self.q
+
+        for length, triplets in self.RADIX4_ZETAS:
+            start = 0
+            for z1, z2, z3 in triplets:
+                for j in range(start, start + length):
+                    a0 = w[j]
+                    a1 = w[j + length]
+                    a2 = w[j + 2 * length]
+                    a3 = w[j + 3 * length]
+
+                    # layer 2L: butterflies (a0, a2) and (a1, a3) with z1.
+                    t = (z1 * a2) % q
+                    a2 = a0 - t
+                    a0 = a0 + t
+                    t = (z1 * a3) % q
+                    a3 = a1 - t
+                    a1 = a1 + t
+
+                    # layer L: butterflies (a0, a1) with z2 and (a2, a3) with z3.
+                    t = (z2 * a1) % q
+                    w[j] = a0 + t
+                    w[j + length] = a0 - t
+                    t = (z3 * a3) % q
+                    w[j + 2 * length] = a2 + t
+                    w[j + 3 * length] = a2 - t
+
+                start = start + 4 * length
+
+        return map(q.__rmod__, w)
+
+    def _inv_NTT_radix4(self, coefficient_list: list) -> list:
+        """
+        Computes the same transform as inv_NTT, merging each pair of butterfly layers
+        (lengths L and 2L) into one pass over blocks of 4L coefficients. The 256^-1
+        factor is merged into the last pass.
+        Args:
+            coefficient_list (list): list of 256 integers representing polynomial coefficients in ntt domain.
+        Returns:
+            w (list): list of integers representing polynomial coefficients.
+        """
+        w = list(coefficient_list)
+        q = self.q
+        f = self.N_INV
+
+        for length, triplets in self.RADIX4_ZETAS_INV[:-1]:
+            start = 0
+            for z1, z2, z3 in triplets:
+                for j in range(start, start + length):
+                    a0 = w[j]
+                    a1 = w[j + length]
+                    a2 = w[j + 2 * length]
+                    a3 = w[j + 3 * length]
+
+                    # layer L: butterflies (a0, a1) with z1 and (a2, a3) with z2.
+                    b0 = a0 + a1
+                    b1 = (z1 * (a0 - a1)) % q
+                    b2 = a2 + a3
+                    b3 = (z2 * (a2 - a3)) % q
+
+                    # layer 2L: butterflies (b0, b2) and (b1, b3) with z3.
+                    w[j] = b0 + b2
+                    w[j + 2 * length] = (z3 * (b0 - b2)) % q
+                    w[j + length] = b1 + b3
+                    w[j + 3 * length] = (z3 * (b1 - b3)) % q
+
+                start = start + 4 * length
+
+        # last pass (lengths 64 and 128) with the multiplication by 256^-1 merged into it.
+        (z1, z2, _), = self.RADIX4_ZETAS_INV[-1][1]
+        z3 = self.ZETA_INV_LAST
+        for j in range(64):
+            a0 = w[j]
+            a1 = w[j + 64]
+            a2 = w[j + 128]
+            a3 = w[j + 192]
+
+            b0 = a0 + a1
+            b1 = (z1 * (a0 - a1)) % q
+            b2 = a2 + a3
+            b3 = (z2 * (a2 - a3)) % q
+
+            w[j] = ((b0 + b2) * f) % q
+            w[j + 128] = (z3 * (b0 - b2)) % q
+            w[j + 64] = ((b1 + b3) * f) % q
+            w[j + 192] = (z3 * (b1 - b3)) % q
+
+        return w
+
+    def NTT_vec(self, vector: list, out: PolyVec = None) -> list:
+        """
+        Computes the ntt of every polynomial in a vector (rows x 256) in one call.
+
+        With numpy available each butterfly layer is a single strided array operation
+        across all the polynomials, otherwise NTT is applied polynomial by polynomial.
+        Args:
+            vector (list): list of polynomials (list of lists of ints).
+            out (PolyVec): optional vector the result is written into instead of a new one,
+                it may be vector itself.
+        Returns:
+            w_hat (PolyVec): list of NTT transformed polynomials, tagged with the ntt domain.
+        Raises:
+            TypeError: If the input is not a list or tuple of lists or tuples.
+            ValueError: If any polynomial does not contain exactly 256 elements.
+            ValueError: If the input is a PolyVec already in the ntt domain.
+        """
+        if not isinstance(vector, (list, tuple)):
+            raise TypeError(f"Expected a list or tuple, got {type(vector).__name__}")
+        if isinstance(vector, PolyVec) and vector.domain == NTT_DOMAIN:
+            raise ValueError("The vector is already in the ntt domain.")
+
+        if not self.use_numpy:
+            if out is None:
+                return PolyVec((self.NTT(p) for p in vector), NTT_DOMAIN)
+            return self._vector_result((self.NTT(p, o) for p, o in zip(vector, out)), out, NTT_DOMAIN)
+
+        self._check_vector(vector)
+
+        q = self.q
+        w_hat = np.array(vector, dtype=np.int64).reshape(-1, self.N) % q
+        rows = w_hat.shape[0]
+        m = 1
+        length = 128
+
+        while length >= 1:
+            blocks = self.N // (2 * length)
+
+            # view every polynomial as blocks of (lower half, upper half) butterfly pairs.
+            w_view = w_hat.reshape(rows, blocks, 2, length)
+            z = self.ZETAS_NP[m : m + blocks].reshape(1, blocks, 1)
+
+            t = (z * w_view[:, :, 1, :]) % q
+            lower = w_view[:, :, 0, :].copy()
+            w_view[:, :, 1, :] = (lower - t) % q
+            w_view[:, :, 0, :] = (lower + t) % q
+
+            m = m + blocks
+            length = length // 2
+
+        return self._vector_result(self._numpy_rows(w_hat, out), out, NTT_DOMAIN)
+
+    def inv_NTT_vec(self, vector: list, out: PolyVec = None) -> list:
+        """
+        Computes the inverse ntt of every polynomial in a vector (rows x 256) in one call.
+
+        With numpy available each butterfly layer is a single strided array operation
+        across all the polynomials, otherwise inv_NTT is applied polynomial by polynomial.
+        Args:
+            vector (list): list of polynomials (list of lists of ints) in ntt domain.
+            out (PolyVec): optional vector the result is written into instead of a new one,
+                it may be vector itself.
+        Returns:
+            w (PolyVec): list of polynomials, tagged with the coefficient domain.
+        Raises:
+            TypeError: If the input is not a list or tuple of lists or tuples.
+            ValueError: If any polynomial does not contain exactly 256 elements.
+            ValueError: If the input is a PolyVec already in the coefficient domain.
+        """
+        if not isinstance(vector, (list, tuple)):
+            raise TypeError(f"Expected a list or tuple, got {type(vector).__name__}")
+        if isinstance(vector, PolyVec) and vector.domain == COEFFICIENT_DOMAIN:
+            raise ValueError("The vector is already in the coefficient domain.")
+
+        if not self.use_numpy:
+            if out is None:
+                return PolyVec(self.inv_NTT(p) for p in vector)
+            return self._vector_result((self.inv_NTT(p, o) for p, o in zip(vector, out)), out, COEFFICIENT_DOMAIN)
+
+        self._check_vector(vector)
+
+        q = self.q
+        w = np.array(vector, dtype=np.int64).reshape(-1, self.N) % q
+        rows = w.shape[0]
+        m = 256
+        length = 1
+
+        while length < 256:
+            blocks = self.N // (2 * length)
+
+            # block b of this layer uses ZETAS_INV[m - 1 - b].
+            w_view = w.reshape(rows, blocks, 2, length)
+            z = self.ZETAS_INV_NP[m - blocks : m][::-1].reshape(1, blocks, 1)
+
+            lower = w_view[:, :, 0, :].copy()
+            upper = w_view[:, :, 1, :]
+            w_view[:, :, 0, :] = (lower + upper) % q
+            w_view[:, :, 1, :] = (z * (lower - upper)) % q
+
+            m = m - blocks
+            length = 2 * length
+
+        w = (w * self.N_INV) % q
+
+        return self._vector_result(self._numpy_rows(w, out), out, COEFFICIENT_DOMAIN)
+
+    def to_ntt(self, vector: list) -> list:
+        """
+        Returns a vector in the ntt domain, transforming it only if it is tagged with the
+        coefficient domain (or is not a PolyVec). A vector already in the ntt domain is
+        returned as is, so callers can convert defensively without paying for it.
+        Args:
+            vector (list): list of polynomials in either domain.
+        Returns:
+            w_hat (PolyVec): the vector in the ntt domain.
+        """
+        if isinstance(vector, PolyVec) and vector.domain == NTT_DOMAIN:
+            return vector
+        return self.NTT_vec(vector)
+
+    def to_coefficients(self, vector: list) -> list:
+        """
+        Returns a vector in the coefficient domain, transforming it only if it is tagged
+        with the ntt domain (or is not a PolyVec).
+        Args:
+            vector (list): list of polynomials in either domain.
+        Returns:
+            w (PolyVec): the vector in the coefficient domain.
+        """
+        if isinstance(vector, PolyVec) and vector.domain == COEFFICIENT_DOMAIN:
+            return vector
+        return self.inv_NTT_vec(vector)
+
+    def lazy(self, vector: list) -> LazyVector:
+        """
+        Wraps a vector of polynomials into a lazy expression over Zq. Sums, differences,
+        scalings and coefficient-wise functions of lazy vectors are fused and only evaluated,
+        in a single pass per coefficient, when the result is observed.
+        Args:
+            vector (list): list of polynomials (list of lists of ints) in either domain.
+        Returns:
+            expression (LazyVector): the vector as a lazy expression.
+        """
+        return LazyVector.of(vector, self.q)
+
+    def _check_vector(self, vector: list):
+        """
+        Checks that every polynomial of a vector is a sequence of 256 elements. The elements
+        of a PolyVec are known to be Poly, and with validation off every vector is trusted,
+        so in both cases only the lengths are checked.
+        """
+        if isinstance(vector, PolyVec) or not self.validate:
+            if any(len(p) != self.N for p in vector):
+                raise ValueError(f"All polynomials must have exactly {self.N} coefficients.")
+            return
+
+        for p in vector:
+            if not isinstance(p, (list, tuple, Poly)):
+                raise TypeError(f"Expected a list or tuple for polynomial, got {type(p).__name__}")
+            if len(p) != self.N:
+                raise ValueError(f"Expected 256 elements, got {len(p)}")
+
+    def _result(self, coefficients, out: Poly) -> list:
+        """
+        Returns coefficients (a sequence or an iterator) as a new Poly, or written into out
+        when it is given. An iterator is consumed while it is written, no list is built.
+        """
+        if out is None:
+            return Poly(coefficients)
+        out.assign(coefficients)
+        return out
+
+    def _vector_result(self, polynomials, out: PolyVec, domain: str) -> list:
+        """
+        Returns polynomials as a new PolyVec tagged with domain, or written into out (and
+        out retagged) when it is given. Each polynomial may be an iterator over its coefficients,
+        which is written into out as it is consumed. Polynomials that are already the elements
+        of out are left in place.
+        """
+        if out is None:
+            return PolyVec(polynomials, domain)
+        polynomials = iter(polynomials)
+        for o in out:
+            p = next(polynomials, None)
+            if p is None:
+                raise ValueError("The output vector has more polynomials than the result.")
+            if p is not o:
+                o.assign(p)
+        if next(polynomials, None) is not None:
+            raise ValueError("The output vector has fewer polynomials than the result.")
+        out.domain = domain
+        return out
+
+    @staticmethod
+    def _numpy_rows(w, out: PolyVec):
+        """
+        Returns the rows of a 2D numpy array for _vector_result: as lists for a new vector, as
+        C int rows copied straight into the buffers of out otherwise.
+        """
+        return w.tolist() if out is None else w.astype(np.intc)
+
+    def _domain(self, vector: list, default: str) -> str:
+        """
+        Returns the domain a vector is tagged with, or default for untagged sequences.
+        """
+        return vector.domain if isinstance(vector, PolyVec) else default
+
     def AddNTT(self, a_vec: list, b_vec: list) -> list:
         """
         Algorithm 44 FIPS 204
@@ -175,14 +577,14 @@ class NTT:
             a_vec (list): first polynomial in ntt domain.
             b_vec (list): second polynomial in ntt domain.  
         Returns:
-            c (list): resulting polynomial in ntt domain after addition.
+            c (Poly): resulting polynomial in ntt domain after addition.
         Raises:
             TypeError: If the inputs are not lists or tuples.
             ValueError: If the input lists are not of equal size.
         """
-        if not isinstance(a_vec, (list, tuple)):
+        if not isinstance(a_vec, (list, tuple, Poly)):
             raise TypeError(f"Expected a list or tuple for a_vec, got {type(a_vec)}")
-        if not isinstance(b_vec, (list, tuple)):
+        if not isinstance(b_vec, (list, tuple, Poly)):
             raise TypeError(f"Expected a list or tuple for b_vec, got {type(b_vec)}")
         if len(a_vec) != len(b_vec):
             raise ValueError(f"both lists must be of equal size to perform NTT multiplication.")
@@ -192,7 +594,7 @@ class NTT:
         for i in range(self.N):
             c[i] = (a_vec[i] + b_vec[i]) % self.q
         
-        return c
+        return Poly(c)
     
     def AddVectorNTT(self, vector1: list, vector2: list) -> list:
         """
@@ -201,7 +603,7 @@ class NTT:
             vector1 (list): First vector of polynomials (list of lists of ints) in NTT domain.
             vector2 (list): Second vector of polynomials (list of lists of ints) in NTT domain.
         Returns:
-            result (list): The resulting vector of polynomials after addition in NTT domain.
+            result (PolyVec): The resulting vector of polynomials after addition in NTT domain.
         Raises:
             TypeError: If the inputs are not lists or tuples.
         """
@@ -216,7 +618,7 @@ class NTT:
         for i in range(len(vector1)):
             result[i] = self.AddNTT(vector1[i], vector2[i])
 
-        return result
+        return PolyVec(result, NTT_DOMAIN)
     
     def AddPolynomials(self, poly1: list, poly2: list) -> list:
         """
@@ -225,13 +627,13 @@ class NTT:
             poly1 (list): First polynomial (list of ints).
             poly2 (list): Second polynomial (list of ints).
         Returns:
-            result (list): The resulting polynomial after addition.
+            result (Poly): The resulting polynomial after addition.
         Raises:
             TypeError: If the inputs are not lists or tuples.
         """
-        if not isinstance(poly1, (list, tuple)):
+        if not isinstance(poly1, (list, tuple, Poly)):
             raise TypeError(f"Expected a list or tuple for poly1, got {type(poly1)}")
-        if not isinstance(poly2, (list, tuple)):
+        if not isinstance(poly2, (list, tuple, Poly)):
             raise TypeError(f"Expected a list or tuple for poly2, got {type(poly2)}")
         if not len(poly1) == len(poly2):
             raise ValueError("Both polynomials must have the same length for addition.")
@@ -240,19 +642,23 @@ class NTT:
         for i in range(len(poly1)):
             result[i] = (poly1[i] + poly2[i]) % self.q
 
-        return result
+        return Poly(result)
     
-    def AddPolynomialVectors(self, vec1: list, vec2: list) -> list:
+    def AddPolynomialVectors(self, vec1: list, vec2: list, out: PolyVec = None) -> list:
         """
-        Adds two vectors of polynomials coefficient-wise.
+        Adds two vectors of polynomials coefficient-wise. Addition is the same in both
+        domains, the result keeps the domain of the inputs.
         Args:
             vec1 (list): First vector of polynomials (list of lists of ints).
             vec2 (list): Second vector of polynomials (list of lists of ints).
+            out (PolyVec): optional vector the result is written into instead of a new one,
+                it may be vec1 or vec2 itself.
         Returns:
 
-            result (list): The resulting vector of polynomials after addition.
+            result (PolyVec): The resulting vector of polynomials after addition.
         Raises:
             TypeError: If the inputs are not lists or tuples.
+            ValueError: If the vectors are tagged with different domains.
         """
         if not isinstance(vec1, (list, tuple)):
             raise TypeError(f"Expected a list or tuple for vec1, got {type(vec1)}")
@@ -260,74 +666,217 @@ class NTT:
             raise TypeError(f"Expected a list or tuple for vec2, got {type(vec2)}")
         if not len(vec1) == len(vec2):
             raise ValueError("Both vectors must have the same length for addition.")
-        
-        result = [[0] * self.N for _ in range(len(vec1))] # initialize result vector
-        for i in range(len(vec1)):
-            result[i] = self.AddPolynomials(vec1[i], vec2[i])
-        return result
+        domain = self._common_domain(vec1, vec2)
+        q = self.q
+
+        result = (map(q.__rmod__, map(add, a, b)) for a, b in zip(vec1, vec2))
+        return self._vector_result(result, out, domain)
+
+    def SubPolynomialVectors(self, vec1: list, vec2: list, out: PolyVec = None) -> list:
+        """
+        Subtracts two vectors of polynomials coefficient-wise, keeping their domain.
+        Args:
+            vec1 (list): First vector of polynomials (list of lists of ints).
+            vec2 (list): Vector of polynomials (list of lists of ints) subtracted from vec1.
+            out (PolyVec): optional vector the result is written into instead of a new one,
+                it may be vec1 or vec2 itself.
+        Returns:
+            result (PolyVec): The resulting vector of polynomials vec1 - vec2.
+        Raises:
+            TypeError: If the inputs are not lists or tuples.
+            ValueError: If the vectors are tagged with different domains.
+        """
+        if not isinstance(vec1, (list, tuple)):
+            raise TypeError(f"Expected a list or tuple for vec1, got {type(vec1)}")
+        if not isinstance(vec2, (list, tuple)):
+            raise TypeError(f"Expected a list or tuple for vec2, got {type(vec2)}")
+        if not len(vec1) == len(vec2):
+            raise ValueError("Both vectors must have the same length for subtraction.")
+        domain = self._common_domain(vec1, vec2)
+        q = self.q
+
+        result = (map(q.__rmod__, map(sub, a, b)) for a, b in zip(vec1, vec2))
+        return self._vector_result(result, out, domain)
+
+    def _common_domain(self, vec1: list, vec2: list) -> str:
+        """
+        Returns the domain shared by two vectors, untagged sequences take the domain of the other.
+        """
+        domain1 = self._domain(vec1, None)
+        domain2 = self._domain(vec2, None)
+        if domain1 and domain2 and domain1 != domain2:
+            raise ValueError(f"Cannot combine a vector in the {domain1} domain with one in the {domain2} domain.")
+        return domain1 or domain2 or COEFFICIENT_DOMAIN
 
-    def multiply_matrix_vector(self, matrix: list, vector: list) -> list:
+    def multiply_matrix_vector(self, matrix: list, vector: list, out: PolyVec = None) -> list:
         """
         Multiplies a matrix of polynomials with a vector of polynomials in NTT domain.
+        A vector tagged with the coefficient domain is transformed first. The matrix is
+        read one row at a time, so a StreamedMatrix is consumed as its rows are generated.
         Args:
-            matrix (list): A matrix of polynomials (list of lists of ints) in NTT domain.
+            matrix (list): A matrix of polynomials (list of lists of ints or StreamedMatrix) in NTT domain.
             vector (list): A vector of polynomials (list of ints) in NTT domain.
+            out (PolyVec): optional vector of len(matrix) polynomials the result is written
+                into instead of a new one. It must not be vector itself.
         Returns:
-            result (list): The resulting vector of polynomials after multiplication in NTT domain.
+            result (PolyVec): The resulting vector of polynomials after multiplication in NTT domain.
         Raises:
             TypeError: If the inputs are not lists or tuples.
             ValueError: If the dimensions of the matrix and vector are incompatible.
         """
-        if not isinstance(matrix, (list, tuple)):
-            raise TypeError(f"Expected a list or tuple for matrix, got {type(matrix)}")
+        if not isinstance(matrix, (list, tuple, StreamedMatrix)):
+            raise TypeError(f"Expected a list, tuple or StreamedMatrix for matrix, got {type(matrix)}")
         if not isinstance(vector, (list, tuple)):
             raise TypeError(f"Expected a list or tuple for vector, got {type(vector)}")
-        if len(matrix) == 0 or len(matrix[0]) != len(vector):
+        columns = matrix.l if isinstance(matrix, StreamedMatrix) else len(matrix[0]) if matrix else 0
+        if len(matrix) == 0 or columns != len(vector):
             raise ValueError("Incompatible dimensions for matrix-vector multiplication.")
+        if self._domain(vector, NTT_DOMAIN) == COEFFICIENT_DOMAIN:
+            vector = self.NTT_vec(vector)
 
-        result = [[0] * self.N for _ in range(len(matrix))] # initialize product of A_cap and NTT(s1)
-        for i in range(len(matrix)):
-            for j in range(len(vector)):
-                element_product = self.MultiplyNTT(matrix[i][j], vector[j])
-                result[i] = self.AddNTT(result[i], element_product)
+        if out is None:
+            return PolyVec((self.multiply_accumulate(row, vector) for row in matrix), NTT_DOMAIN)
+        return self._vector_result((self.multiply_accumulate(row, vector, o) for row, o in zip(matrix, out)), out, NTT_DOMAIN)
 
-        return result
+    def multiply_accumulate(self, row: list, vector: list, out: Poly = None) -> list:
+        """
+        Computes the NTT domain inner product sum_j row[j] ◦ vector[j] in a single pass.
+
+        The products are summed over j before reducing, so every output coefficient is
+        reduced once and no intermediate polynomial is allocated.
+        Args:
+            row (list): A vector of polynomials (one row of a matrix) in NTT domain.
+            vector (list): A vector of polynomials in NTT domain of the same length as row.
+            out (Poly): optional polynomial the result is written into instead of a new one.
+        Returns:
+            result (Poly): The resulting polynomial in NTT domain.
+        """
+        q = self.q
+        products = [map(mul, a, b) for a, b in zip(row, vector)]
+        return self._result(map(q.__rmod__, map(sum, zip(*products))), out)
 
-    def multiply_polynomial_vector(self, poly: list, vector: list) -> list:
+    def multiply_polynomial_vector(self, poly: list, vector: list, out: PolyVec = None) -> list:
         """
         Multiplies a polynomial with a vector of polynomials in NTT domain.
+        A vector tagged with the coefficient domain is transformed first.
         Args:
             poly (list): A polynomial (list of ints) in NTT domain.
             vector (list): A vector of polynomials (list of lists of ints) in NTT domain.
+            out (PolyVec): optional vector the result is written into instead of a new one,
+                it may be vector itself.
         Returns:
-            result (list): The resulting vector of polynomials after multiplication in NTT domain.
+            result (PolyVec): The resulting vector of polynomials after multiplication in NTT domain.
         Raises:
             TypeError: If the inputs are not lists or tuples.
             ValueError: If the dimensions of the polynomial and vector are incompatible.
         """
-        if not isinstance(poly, (list, tuple)):
+        if not isinstance(poly, (list, tuple, Poly)):
             raise TypeError(f"Expected a list or tuple for poly, got {type(poly)}")
         if not isinstance(vector, (list, tuple)):
             raise TypeError(f"Expected a list or tuple for vector, got {type(vector)}")
         if len(vector) == 0 or len(vector[0]) != len(poly):
             raise ValueError("Incompatible dimensions for polynomial-vector multiplication.")
+        if self._domain(vector, NTT_DOMAIN) == COEFFICIENT_DOMAIN:
+            vector = self.NTT_vec(vector)
 
-        result = [[0] * self.N for _ in range(len(vector))] # initialize product of poly and vector
-        for j in range(len(vector)):
-            element_product = self.MultiplyNTT(poly, vector[j])
-            for i in range(self.N):
-                result[j][i] = element_product[i] % self.q
-
-        return result
+        q = self.q
+        result = (map(q.__rmod__, map(mul, poly, p)) for p in vector)
+        return self._vector_result(result, out, NTT_DOMAIN)
     
-    def multiply_scalar_vector(self, scalar: int, vector: list) -> list:
+    def sparse_multiply(self, c: list, poly: list, out: Poly = None) -> list:
+        """
+        Multiplies a sparse polynomial c with coefficients in {-1, 0, 1} (such as the
+        challenge from SampleInBall) with a polynomial in the coefficient domain.
+
+        Each nonzero c[i] contributes ±X^i·poly, a signed negacyclic rotation of poly,
+        so the product is a sum of tau rotations and never leaves the coefficient domain.
+        The rotations are done as shifts of poly packed into a single integer.
+        Args:
+            c (list or SparsePoly): A polynomial (list of ints) with coefficients in {-1, 0, 1},
+                or its nonzero coefficients as a SparsePoly.
+            poly (list): A polynomial (list of ints) in coefficient domain.
+            out (Poly): optional polynomial the result is written into instead of a new one,
+                it may be poly itself.
+        Returns:
+            result (Poly): The product c·poly mod (X^256 + 1) with coefficients in [0, q - 1].
+        Raises:
+            TypeError: If the inputs are not lists or tuples.
+            ValueError: If the inputs do not contain exactly 256 elements.
+            ValueError: If c has coefficients outside {-1, 0, 1}.
         """
-        Multiplies a scalar with a vector of polynomials in NTT domain.
+        return self.sparse_multiply_vector(c, [poly], None if out is None else PolyVec([out]))[0]
+
+    def sparse_multiply_vector(self, c: list, vector: list, out: PolyVec = None) -> list:
+        """
+        Multiplies a sparse polynomial c with coefficients in {-1, 0, 1} with every
+        polynomial of a vector in the coefficient domain (see sparse_multiply).
+        Args:
+            c (list or SparsePoly): A polynomial (list of ints) with coefficients in {-1, 0, 1},
+                or its nonzero coefficients as a SparsePoly.
+            vector (list): A vector of polynomials (list of lists of ints) in coefficient domain.
+            out (PolyVec): optional vector the result is written into instead of a new one,
+                it may be vector itself.
+        Returns:
+            result (PolyVec): The resulting vector of polynomials with coefficients in [0, q - 1].
+        Raises:
+            TypeError: If the inputs are not lists or tuples.
+            ValueError: If the polynomials do not contain exactly 256 elements.
+            ValueError: If c has coefficients outside {-1, 0, 1}.
+            ValueError: If the vector is tagged with the ntt domain.
+        """
+        if not isinstance(vector, (list, tuple)):
+            raise TypeError(f"Expected a list or tuple for vector, got {type(vector)}")
+        if any(len(poly) != self.N for poly in vector):
+            raise ValueError(f"All polynomials must have exactly {self.N} coefficients.")
+        if isinstance(c, SparsePoly):
+            if self.validate and (any(s not in (-1, 1) for s in c.signs) or any(not 0 <= i < self.N for i in c.positions)):
+                raise ValueError("A sparse c must have signs in {-1, 1} at positions in [0, N - 1].")
+        else:
+            if not isinstance(c, (list, tuple, Poly)):
+                raise TypeError(f"Expected a list or tuple for c, got {type(c)}")
+            if len(c) != self.N:
+                raise ValueError(f"All polynomials must have exactly {self.N} coefficients.")
+            if self.validate and any(x not in (-1, 0, 1) for x in c):
+                raise ValueError("All coefficients of c must be in {-1, 0, 1}.")
+        if self._domain(vector, COEFFICIENT_DOMAIN) == NTT_DOMAIN:
+            raise ValueError("The vector must be in the coefficient domain.")
+
+        N = self.N
+        q = self.q
+
+        # a rotation by X^i is a shift by i lanes of 32 bits, lanes N to 2N - 1 wrap around negated.
+        if isinstance(c, SparsePoly):
+            positive_shifts = [32 * i for i, sign in zip(c.positions, c.signs) if sign == 1]
+            negative_shifts = [32 * i for i, sign in zip(c.positions, c.signs) if sign == -1]
+        else:
+            positive_shifts = [32 * i for i in range(N) if c[i] == 1]
+            negative_shifts = [32 * i for i in range(N) if c[i] == -1]
+
+        def products():
+            for poly in vector:
+                packed = _pack_lanes(map(q.__rmod__, poly))
+                positive = _unpack_lanes(sum(packed << shift for shift in positive_shifts), 2 * N)
+                negative = _unpack_lanes(sum(packed << shift for shift in negative_shifts), 2 * N)
+
+                # (a - a_wrap) - (b - b_wrap) for the lanes i and N + i.
+                yield map(q.__rmod__, map(sub,
+                    map(sub, positive, islice(positive, N, None)),
+                    map(sub, negative, islice(negative, N, None)),
+                ))
+
+        return self._vector_result(products(), out, COEFFICIENT_DOMAIN)
+
+    def multiply_scalar_vector(self, scalar: int, vector: list, out: PolyVec = None) -> list:
+        """
+        Multiplies a scalar with a vector of polynomials. Scaling is the same in both
+        domains, the result keeps the domain of the input.
         Args:
             scalar (int): A scalar integer.
-            vector (list): A vector of polynomials (list of lists of ints) in NTT domain.
+            vector (list): A vector of polynomials (list of lists of ints) in either domain.
+            out (PolyVec): optional vector the result is written into instead of a new one,
+                it may be vector itself.
         Returns:
-            result (list): The resulting vector of polynomials after multiplication in NTT domain.
+            result (PolyVec): The resulting vector of polynomials after multiplication.
         Raises:
             TypeError: If the inputs are not lists or tuples.
         """
@@ -336,12 +885,10 @@ class NTT:
         if not isinstance(scalar, int):
             raise TypeError(f"Expected an integer for scalar, got {type(scalar)}")
 
-        result = [[0] * self.N for _ in range(len(vector))] # initialize product of scalar and vector
-        for j in range(len(vector)):
-            for i in range(self.N):
-                result[j][i] = (scalar * vector[j][i]) % self.q
-
-        return result
+        q = self.q
+        scale = partial(mul, scalar)
+        result = (map(q.__rmod__, map(scale, p)) for p in vector)
+        return self._vector_result(result, out, self._domain(vector, COEFFICIENT_DOMAIN))
 
     def power2round(self, r: int) -> tuple[int, int]:
         """
@@ -379,8 +926,8 @@ class NTT:
         """
         if not isinstance(t_vec, (list, tuple)):
             raise TypeError(f"Expected a list or tuple for t_vec, got {type(t_vec)}")
-        for poly in t_vec:
-            if not isinstance(poly, (list, tuple)):
+        for poly in (t_vec if self.validate and not isinstance(t_vec, PolyVec) else ()):
+            if not isinstance(poly, (list, tuple, Poly)):
                 raise TypeError(f"Expected a list or tuple for polynomial, got {type(poly)}")
             for coeff in poly:
                 if not isinstance(coeff, (int, float)):
@@ -400,7 +947,7 @@ class NTT:
             t1_vec.append(poly_t1)
             t0_vec.append(poly_t0)
 
-        return (t1_vec, t0_vec)
+        return (PolyVec(t1_vec), PolyVec(t0_vec))
 
     def SubNTT(self, a_vec: list, b_vec: list) -> list:
         """
@@ -409,7 +956,7 @@ class NTT:
             a_vec (list): first polynomial in ntt domain.
             b_vec (list): second polynomial in ntt domain.
         Returns:
-            c (list): resulting polynomial in ntt domain after subtraction.
+            c (Poly): resulting polynomial in ntt domain after subtraction.
         """
         if len(a_vec) != len(b_vec):
             raise ValueError(f"both lists must be of equal size to perform NTT multiplication.")
@@ -419,6 +966,6 @@ class NTT:
         for i in range(self.N):
             c[i] = (a_vec[i] - b_vec[i]) % self.q
         
-        return c
+        return Poly(c)
 
 
@@ -1,12 +1,27 @@
 
 
+from operator import add, ne
+
+from .poly import Poly, PolyVec, hint_indices
+
+try:
+    import numpy as np
+except ImportError: # numpy is an optional dependency.
+    np = None
+
 class Operations:
-    def __init__(self, gamma2):
+    def __init__(self, gamma2, validate: bool = True, use_numpy: bool = True):
         self.N = 256 # fixed for all
         self.q = 8380417 # fixed for all
 
         self.gamma2 = gamma2
 
+        # when False the per-coefficient input checks are skipped, for callers that only pass internal values.
+        self.validate = validate
+
+        # the vector decompositions run on numpy when it is installed and not disabled.
+        self.use_numpy = use_numpy and np is not None
+
     def decompose(self, r: int) -> tuple[int, int]:
         """
         Algorithm 36 FIPS 204
@@ -22,7 +37,7 @@ class Operations:
         Raises:
             TypeError: If r is not an integer.
         """
-        if not isinstance(r, int):
+        if self.validate and not isinstance(r, int):
             raise TypeError("Input r must be an integer.")
 
         r_plus = r % self.q
@@ -38,7 +53,7 @@ class Operations:
             r1 = 0
             r0 = r0 - 1
         else:
-            r1 = int((r_plus - r0) / (2 * self.gamma2))
+            r1 = (r_plus - r0) // mod_val
 
         return r1, r0
     
@@ -52,7 +67,7 @@ class Operations:
         Raises:
             TypeError: If r is not an integer.
         """
-        if not isinstance(r, int):
+        if self.validate and not isinstance(r, int):
             raise TypeError("Input r must be an integer.")
         
         r1, r0 = self.decompose(r)
@@ -68,49 +83,185 @@ class Operations:
         Raises:
             TypeError: If r is not an integer.
         """
-        if not isinstance(r, int):
+        if self.validate and not isinstance(r, int):
             raise TypeError("Input r must be an integer.")
 
         _, r0 = self.decompose(r)
         return r0
     
-    def lowBits_polynomial(self, r: list):
+    def lowBits_polynomial(self, r: list, out: Poly = None):
         """
         returns the low bits r0 from the decomposition of r.
         Args:
             r (list): a polnomial where all coefficients are integers in the range [0, q-1].
+            out (Poly): optional polynomial the result is written into instead of a new one.
         Returns:
             r0 (list): The low bits r0.
         Raises:
             TypeError: If r is not an list.
         """
 
-        if not isinstance(r, list):
+        if not isinstance(r, (list, Poly)):
             raise TypeError("Input r must be an list.")
 
-        r0 = [0 for _ in range(self.N)]
-        for i in range(self.N):
-            r0[i] = self.lowBits(r[0])
-        return r0
+        return self.lowbits_vec([r], None if out is None else PolyVec([out]))[0]
     
-    def lowBits_vector(self, r: list):
+    def lowBits_vector(self, r: list, out: PolyVec = None):
         """
-        returns the low bits r0 from the decomposition of r.
+        returns the low bits r0 from the decomposition of r, see lowbits_vec.
+        """
+        return self.lowbits_vec(r, out)
+
+    def _vector_rows(self, r) -> list:
+        """
+        Returns the polynomials of the vector r as a list, checking them in full validation mode.
+        """
+        rows = r if isinstance(r, list) else list(r)
+        if self.validate and not all(isinstance(poly, (list, tuple, Poly)) for poly in rows):
+            raise TypeError("Input r must be an list of polynomials.")
+        return rows
+
+    def _decompose_constants(self) -> tuple[int, int, int]:
+        """
+        Returns (2*gamma2, gamma2 - 1, q - gamma2), with which Decompose of x in [0, q-1] is
+            r1 = (x + gamma2 - 1) // (2*gamma2), r0 = x - r1*(2*gamma2)   if x < q - gamma2
+            r1 = 0,                               r0 = x - q                otherwise
+        the second case being the one where r - r0 = q - 1 in Algorithm 36.
+        """
+        return 2 * self.gamma2, self.gamma2 - 1, self.q - self.gamma2
+
+    def _decompose_numpy(self, rows: list):
+        """
+        Decompose of every coefficient of rows as two (len(rows), N) numpy arrays (r1, r0).
+        """
+        alpha, offset, bound = self._decompose_constants()
+        x = np.array(rows, dtype=np.int64).reshape(-1, self.N) % self.q
+        r1 = (x + offset) // alpha
+        r0 = x - r1 * alpha
+        wrap = x >= bound
+        r1[wrap] = 0
+        r0[wrap] = x[wrap] - self.q
+        return r1, r0
+
+    @staticmethod
+    def _vector_out(values, out: PolyVec) -> PolyVec:
+        """
+        Returns values (an iterable of polynomials, each a sequence or an iterator over its
+        coefficients) as a PolyVec, written into out when it is given. An iterator is written
+        as it is consumed, no list is built.
+        """
+        if out is None:
+            return PolyVec(values)
+        values = iter(values)
+        for o in out:
+            poly = next(values, None)
+            if poly is None:
+                raise ValueError("The output vector has more polynomials than the result.")
+            o.assign(poly)
+        if next(values, None) is not None:
+            raise ValueError("The output vector has fewer polynomials than the result.")
+        return out
+
+    @staticmethod
+    def _numpy_rows(values, out: PolyVec):
+        """
+        Returns the rows of a 2D numpy array for _vector_out: as lists for a new vector, as
+        C int rows copied straight into the buffers of out otherwise.
+        """
+        return values.tolist() if out is None else values.astype(np.intc)
+
+    def decompose_vec(self, r: list, out: tuple = None) -> tuple[PolyVec, PolyVec]:
+        """
+        Algorithm 36 FIPS 204 applied to every coefficient of a vector of polynomials at once,
+        with integer arithmetic only (numpy arrays when available).
         Args:
-            r (list): a polnomial where all coefficients are integers in the range [0, q-1].
+            r (list): a vector of polynomials (any iterable of polynomials) with integer coefficients.
+            out (tuple): optional pair of vectors (r1, r0) of len(r) polynomials the results are
+                written into instead of new ones, either may be r itself.
         Returns:
-            r0 (list): The low bits r0.
+            tuple (PolyVec, PolyVec): r1, r0, the high bits and the low bits of every coefficient.
         Raises:
-            TypeError: If r is not an list.
+            TypeError: If r is not a vector of polynomials.
         """
+        out1, out0 = (None, None) if out is None else out
+        rows = self._vector_rows(r)
+        if self.use_numpy:
+            r1, r0 = self._decompose_numpy(rows)
+            return self._vector_out(self._numpy_rows(r1, out1), out1), self._vector_out(self._numpy_rows(r0, out0), out0)
 
-        if not (isinstance(r, list) or isinstance(r[0], list)):
-            raise TypeError("Input r must be an list of polynomials.")
+        # r1 and r0 of a polynomial are built as unboxed arrays straight from the generators, both
+        # before either is written, so out may alias r.
+        q = self.q
+        alpha, offset, bound = self._decompose_constants()
 
-        r0 = [[0 for _ in range(self.N)] for _ in range(len(r))]
-        for i in range(len(r)):
-            r0[i] = self.lowBits_polynomial(r[i])
-        return r0
+        def halves():
+            for poly in rows:
+                r1 = Poly((c + offset) // alpha if c < bound else 0 for c in map(q.__rmod__, poly))
+                yield r1, Poly(c - h * alpha if c < bound else c - q for c, h in zip(map(q.__rmod__, poly), r1))
+
+        if out is None:
+            r1_vec, r0_vec = PolyVec(), PolyVec()
+            for r1, r0 in halves():
+                r1_vec.append(r1)
+                r0_vec.append(r0)
+            return r1_vec, r0_vec
+        if not len(out1) == len(out0) == len(rows):
+            raise ValueError(f"Expected output vectors of {len(rows)} polynomials, got {len(out1)} and {len(out0)}")
+        for (r1, r0), o1, o0 in zip(halves(), out1, out0):
+            o1.assign(r1)
+            o0.assign(r0)
+        return out1, out0
+
+    def highbits_vec(self, r: list, out: PolyVec = None) -> PolyVec:
+        """
+        returns the high bits r1 from the decomposition of every coefficient of a vector of polynomials.
+        Args:
+            r (list): a vector of polynomials (any iterable of polynomials) with integer coefficients.
+            out (PolyVec): optional vector of len(r) polynomials the result is written into
+                instead of a new one, it may be r itself.
+        Returns:
+            r1 (PolyVec): The high bits r1.
+        Raises:
+            TypeError: If r is not a vector of polynomials.
+        """
+        return self._vector_out(self._highbits_rows(self._vector_rows(r), out), out)
+
+    def _highbits_rows(self, rows: list, out: PolyVec = None):
+        """
+        HighBits of every coefficient of rows, one iterator per polynomial (numpy rows with numpy).
+        """
+        if self.use_numpy:
+            return self._numpy_rows(self._decompose_numpy(rows)[0], out)
+
+        q = self.q
+        alpha, offset, bound = self._decompose_constants()
+        return (
+            ((c + offset) // alpha if c < bound else 0 for c in map(q.__rmod__, poly))
+            for poly in rows
+        )
+
+    def lowbits_vec(self, r: list, out: PolyVec = None) -> PolyVec:
+        """
+        returns the low bits r0 from the decomposition of every coefficient of a vector of polynomials.
+        Args:
+            r (list): a vector of polynomials (any iterable of polynomials) with integer coefficients.
+            out (PolyVec): optional vector of len(r) polynomials the result is written into
+                instead of a new one, it may be r itself.
+        Returns:
+            r0 (PolyVec): The low bits r0.
+        Raises:
+            TypeError: If r is not a vector of polynomials.
+        """
+        rows = self._vector_rows(r)
+        if self.use_numpy:
+            return self._vector_out(self._numpy_rows(self._decompose_numpy(rows)[1], out), out)
+
+        q = self.q
+        alpha, offset, bound = self._decompose_constants()
+        return self._vector_out((
+            (c - (c + offset) // alpha * alpha if c < bound else c - q for c in map(q.__rmod__, poly))
+            for poly in rows
+        ), out)
 
     def make_hint(self, z: int, r:int) -> bool:
         """
@@ -124,15 +275,83 @@ class Operations:
             TypeError: If z or r is not an integer.
         """
         # make some input checks here.
-        if not isinstance(z, int):
-            raise TypeError("Input z must be an integer.")
-        if not isinstance(r, int):
-            raise TypeError("Input r must be an integer.")
+        if self.validate:
+            if not isinstance(z, int):
+                raise TypeError("Input z must be an integer.")
+            if not isinstance(r, int):
+                raise TypeError("Input r must be an integer.")
 
         r1 = self.highBits(r)
         v1 = self.highBits(r + z)
         return v1 != r1
     
+    def make_hint_vec(self, z: list, r: list) -> list[int]:
+        """
+        computes the hint vector indicating whether adding z to r alters the high bits of r, for
+        every coefficient of two vectors of polynomials at once.
+        Args:
+            z (list): a vector of polynomials (any iterable of polynomials) with integer coefficients.
+            r (list): a vector of polynomials (any iterable of polynomials) with integer coefficients.
+        Returns:
+            h (list[int]): one 256-bit bitset int per polynomial, bit j is set when the high bits of
+                coefficient j change.
+        Raises:
+            TypeError: If z or r is not a vector of polynomials.
+            ValueError: If z and r are not of the same length.
+        """
+        z_rows = self._vector_rows(z)
+        r_rows = self._vector_rows(r)
+        if len(z_rows) != len(r_rows):
+            raise ValueError("Input vectors must be of the same length.")
+
+        if self.use_numpy:
+            r_np = np.array(r_rows, dtype=np.int64).reshape(-1, self.N)
+            z_np = np.array(z_rows, dtype=np.int64).reshape(-1, self.N)
+            changed = self._decompose_numpy(r_np)[0] != self._decompose_numpy(r_np + z_np)[0]
+            packed = np.packbits(changed, axis=1, bitorder="little")
+            return [int.from_bytes(row.tobytes(), "little") for row in packed]
+
+        r1 = self._highbits_rows(r_rows)
+        v1 = self._highbits_rows([map(add, z_poly, r_poly) for z_poly, r_poly in zip(z_rows, r_rows)])
+        return [
+            sum(1 << j for j, changed in enumerate(map(ne, r1_poly, v1_poly)) if changed)
+            for r1_poly, v1_poly in zip(r1, v1)
+        ]
+
+    def make_hint_low_bits_vec(self, a0: list, a1: list) -> list[int]:
+        """
+        computes the hint vector of MakeHint(-c.t0, w - c.s2 + c.t0) from the decomposition
+        w = w1*(2*gamma2) + w0 of the signer, without decomposing anything again.
+
+        With a0 = w0 - c.s2 + c.t0, the high bits change exactly when a0 leaves [-gamma2, gamma2],
+        or when a0 = -gamma2 and a1 != 0 (the reference implementation's MakeHint). This is only
+        equivalent to the definition once ||w0 - c.s2|| < gamma2 - beta and ||c.t0|| < gamma2,
+        which ML-DSA.Sign checks before it accepts a hint.
+        Args:
+            a0 (list): the vector w0 - c.s2 + c.t0, as integers congruent mod q (any iterable of polynomials).
+            a1 (list): the vector w1 of the high bits of w.
+        Returns:
+            h (list[int]): one 256-bit bitset int per polynomial, bit j is the hint of coefficient j.
+        Raises:
+            ValueError: If a0 and a1 are not of the same length.
+        """
+        a0_rows = self._vector_rows(a0)
+        if len(a0_rows) != len(a1):
+            raise ValueError("Input vectors must be of the same length.")
+
+        # t = a0 + gamma2 mod q is in [0, 2*gamma2] exactly when -gamma2 <= a0 <= gamma2.
+        q = self.q
+        gamma2 = self.gamma2
+        alpha = 2 * gamma2
+        return [
+            sum(
+                1 << j
+                for j, (t, high) in enumerate(zip([(c + gamma2) % q for c in a0_poly], a1_poly))
+                if t > alpha or (t == 0 and high != 0)
+            )
+            for a0_poly, a1_poly in zip(a0_rows, a1)
+        ]
+
     def make_hint_polynomial(self, z_poly: list[int], r_poly: list[int]) -> list[bool]:
         """
         computes hint polynomial indicating whether adding z to r alters the high bits of r for each coefficient.
@@ -145,10 +364,11 @@ class Operations:
             TypeError: If z_poly or r_poly is not a list of integers.
             ValueError: If z_poly and r_poly are not of the same length.
         """
-        if not isinstance(z_poly, list) or not all(isinstance(x, int) for x in z_poly):
-            raise TypeError("Input z_poly must be a list of integers.")
-        if not isinstance(r_poly, list) or not all(isinstance(x, int) for x in r_poly):
-            raise TypeError("Input r_poly must be a list of integers.")
+        if self.validate:
+            if not isinstance(z_poly, (list, Poly)) or not all(isinstance(x, int) for x in z_poly):
+                raise TypeError("Input z_poly must be a list of integers.")
+            if not isinstance(r_poly, (list, Poly)) or not all(isinstance(x, int) for x in r_poly):
+                raise TypeError("Input r_poly must be a list of integers.")
         if len(z_poly) != len(r_poly):
             raise ValueError("Input polynomials must be of the same length.")
 
@@ -171,10 +391,11 @@ class Operations:
             TypeError: If z_vec or r_vec is not a list of lists of integers.
             ValueError: If z_vec and r_vec are not of the same length.
         """
-        if not isinstance(z_vec, list) or not all(isinstance(poly, list) and all(isinstance(x, int) for x in poly) for poly in z_vec):
-            raise TypeError("Input z_vec must be a list of lists of integers.")
-        if not isinstance(r_vec, list) or not all(isinstance(poly, list) and all(isinstance(x, int) for x in poly) for poly in r_vec):
-            raise TypeError("Input r_vec must be a list of lists of integers.")
+        if self.validate:
+            if not isinstance(z_vec, list) or not all(isinstance(poly, (list, Poly)) and all(isinstance(x, int) for x in poly) for poly in z_vec):
+                raise TypeError("Input z_vec must be a list of lists of integers.")
+            if not isinstance(r_vec, list) or not all(isinstance(poly, (list, Poly)) and all(isinstance(x, int) for x in poly) for poly in r_vec):
+                raise TypeError("Input r_vec must be a list of lists of integers.")
         if len(z_vec) != len(r_vec):
             raise ValueError("Input vectors must be of the same length.")
 
@@ -197,12 +418,13 @@ class Operations:
             TypeError: If h is not a boolean.
             TypeError: If r is not an integer.
         """
-        if not isinstance(h, (int, bool)):
-            raise TypeError("Input h must be a boolean or integer(0, 1).")
-        if not isinstance(r, int):
-            raise TypeError("Input r must be an integer.")
+        if self.validate:
+            if not isinstance(h, (int, bool)):
+                raise TypeError("Input h must be a boolean or integer(0, 1).")
+            if not isinstance(r, int):
+                raise TypeError("Input r must be an integer.")
 
-        m = int((self.q - 1) / (2 * self.gamma2))
+        m = (self.q - 1) // (2 * self.gamma2)
 
         r1, r0 = self.decompose(r)
 
@@ -212,3 +434,27 @@ class Operations:
             return (r1 - 1) % m
         return r1
 
+    def use_hint_vec(self, h: list, r: list) -> PolyVec:
+        """
+        Returns the high bits of every coefficient of r adjusted according to the hints h.
+
+        The high bits of the whole vector come from highbits_vec, then only the coefficients
+        whose hint bit is set (at most omega of them) are adjusted as in use_hint.
+        Args:
+            h (list): a vector of hint polynomials, bitset ints or lists of coefficients in {0, 1}.
+            r (list): a vector of polynomials with integer coefficients.
+        Returns:
+            r1 (PolyVec): The adjusted high bits.
+        Raises:
+            ValueError: If h and r are not of the same length.
+        """
+        if len(h) != len(r):
+            raise ValueError("Input vectors must be of the same length.")
+
+        r1 = self.highbits_vec(r)
+        m = (self.q - 1) // (2 * self.gamma2)
+        for hint_poly, r_poly, r1_poly in zip(h, r, r1):
+            for j in hint_indices(hint_poly):
+                _, r0 = self.decompose(r_poly[j])
+                r1_poly[j] = (r1_poly[j] + 1) % m if r0 > 0 else (r1_poly[j] - 1) % m
+        return r1
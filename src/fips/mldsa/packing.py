@@ -1,14 +1,18 @@
 from .conversion import Conversion
+from .poly import Poly, hint_indices
 
 class Packing:
-    def __init__(self, omega, k):
+    def __init__(self, omega, k, validate: bool = True):
         self.N = 256 # fixed for all
         self.q = 8380417 # fixed for all
 
         self.omega = omega
         self.k = k
 
-        self.convert = Conversion()
+        # when False the per-coefficient input scans are skipped, the length checks always run.
+        self.validate = validate
+
+        self.convert = Conversion(validate)
 
     def simple_bit_pack(self, w: list[int], b: int) -> bytes:
         """
@@ -29,7 +33,7 @@ class Packing:
             ValueError: If values/lengths are out of expected bounds.
         """
         # --- Validation ---
-        if not isinstance(w, list) or not all(isinstance(c, int) for c in w):
+        if not isinstance(w, (list, Poly)):
             raise TypeError("w must be a list of integers.")
         if not isinstance(b, int):
             raise TypeError("b must be an integer.")
@@ -37,9 +41,11 @@ class Packing:
             raise ValueError("Polynomial w must have exactly 256 coefficients.")
         if b < 1:
             raise ValueError("b must be at least 1.")
-        if any(c < 0 or c > b for c in w):
-            # print(w)
-            raise ValueError(f"All coefficients must be in the range [0, {b}].")
+        if self.validate:
+            if not isinstance(w, Poly) and not all(isinstance(c, int) for c in w):
+                raise TypeError("w must be a list of integers.")
+            if any(c < 0 or c > b for c in w):
+                raise ValueError(f"All coefficients must be in the range [0, {b}].")
 
 
         # --- Bit-packing ---
@@ -74,7 +80,7 @@ class Packing:
         """
 
         # --- Input Validation ---
-        if not isinstance(w, list) or not all(isinstance(x, int) for x in w):
+        if not isinstance(w, (list, Poly)):
             raise TypeError("w must be a list of integers.")
         if not isinstance(a, int) or not isinstance(b, int):
             raise TypeError("a and b must be integers.")
@@ -82,8 +88,11 @@ class Packing:
             raise ValueError("a and b must be non-negative integers.")
         if len(w) != 256:
             raise ValueError("w must have exactly 256 coefficients.")
-        if any(x < -a or x > b for x in w):
-            raise ValueError(f"Each coefficient must be in the range [-{a}, {b}].")
+        if self.validate:
+            if not isinstance(w, Poly) and not all(isinstance(x, int) for x in w):
+                raise TypeError("w must be a list of integers.")
+            if any(x < -a or x > b for x in w):
+                raise ValueError(f"Each coefficient must be in the range [-{a}, {b}].")
 
         # --- Bit Packing ---
         bitlen = (a + b).bit_length()
@@ -130,26 +139,16 @@ class Packing:
         if len(v) != expected_len:
             raise ValueError(f"Expected input length = {expected_len} bytes for a + b = {a + b}, got {len(v)}.")
 
-        # --- Step 2: Convert bytes to bitstring ---
-        z = self.convert.bytes_to_bits(v)
-
-        # --- Step 3–5: Decode coefficients ---
-        w = []
-        for i in range(256):
-            start = i * c
-            end = start + c
-            bits = z[start:end]
-            decoded = self.convert.bits_to_integer(bits, c)
-            w.append(b - decoded)
-
-        return w
+        # --- Step 2–5: Decode coefficients, straight from the bytes ---
+        return Poly([b - decoded for decoded in self._unpack_integers(v, c)])
 
     def hint_bit_pack(self, h: list[list[int]]) -> bytes:
         """
         Implements FIPS 204 Algorithm 20: HintBitPack(h)
     
         Args:
-            h (list[list[int]]): A list of k polynomials, each of 256 binary coefficients.
+            h (list): A list of k hint polynomials, each a 256-bit bitset int (bit j is
+                coefficient j) or a list of 256 binary coefficients.
     
         Returns:
             bytes (bytes): Byte string of length omega + k representing the packed hint vector.
@@ -159,21 +158,25 @@ class Packing:
         """
         if not isinstance(h, list) or len(h) != self.k:
             raise ValueError(f"h must be a list of {self.k} polynomials.")
-        if not all(isinstance(poly, list) and len(poly) == 256 for poly in h):
-            raise ValueError("Each polynomial in h must be a list of 256 binary coefficients.")
-        if not all(c in (0, 1) for poly in h for c in poly):
-            raise ValueError("All coefficients in h must be 0 or 1.")
+        for poly in h:
+            if isinstance(poly, int):
+                if poly < 0 or poly.bit_length() > 256:
+                    raise ValueError("Each bitset in h must hold 256 bits.")
+            elif not isinstance(poly, list) or len(poly) != 256:
+                raise ValueError("Each polynomial in h must be a list of 256 binary coefficients.")
+            elif self.validate and not all(c in (0, 1) for c in poly):
+                raise ValueError("All coefficients in h must be 0 or 1.")
     
         y = [0] * (self.omega + self.k)
         index = 0
     
         for i in range(self.k):
-            for j in range(256):
-                if h[i][j] == 1:
-                    if index >= self.omega:
-                        raise ValueError("Number of 1s in h exceeds omega.")
-                    y[index] = j
-                    index += 1
+            # only the 1 coefficients are visited, in increasing order.
+            for j in hint_indices(h[i]):
+                if index >= self.omega:
+                    raise ValueError("Number of 1s in h exceeds omega.")
+                y[index] = j
+                index += 1
             if index > 255:
                 raise ValueError("index exceeds 255; encoding would overflow a byte.")
             y[self.omega + i] = index
@@ -208,19 +211,18 @@ class Packing:
         if len(v) != expected_length:
             raise ValueError(f"Input length must be {expected_length} bytes for b = {b}.")
 
-        # --- Convert bytes to bitstring ---
-        z = self.convert.bytes_to_bits(v)
+        # --- Reconstruct coefficients, straight from the bytes ---
+        return Poly(self._unpack_integers(v, c))
 
-        # --- Reconstruct coefficients ---
-        w = []
-        for i in range(256):
-            start = i * c
-            end = start + c
-            bits = z[start:end]
-            coeff = self.convert.bits_to_integer(bits, c)
-            w.append(coeff)
-
-        return w 
+    def _unpack_integers(self, v: bytes, c: int) -> list[int]:
+        """
+        Returns the 256 c-bit integers packed in v, what BytesToBits followed by BitsToInteger
+        on every c-bit slice gives, without building the bit string: bit j of byte i is bit
+        8*i + j of v read as one little-endian integer, so every coefficient is a shift and a mask.
+        """
+        packed = int.from_bytes(v, "little")
+        mask = (1 << c) - 1
+        return [(packed >> shift) & mask for shift in range(0, self.N * c, c)]
 
     def hint_bit_unpack(self, y: bytes):
         """
@@ -232,7 +234,8 @@ class Packing:
             k (int): Number of polynomials (dimension).
 
         Returns:
-            list of polynomials (list[list[int]]): h, a list of k polynomials, each being a list of ω-bit coefficients (0 or 1).
+            list of polynomials (list[int]): h, a list of k hint polynomials, each a 256-bit bitset int
+                where bit j is coefficient j, or None if y is malformed.
         Raises:
             ValueError: If y is malformed or does not conform to expected structure.
         """
@@ -241,8 +244,8 @@ class Packing:
         if len(y) != self.omega + self.k:
             raise ValueError(f"Invalid input length: expected {self.omega + self.k}, got {len(y)}")
 
-        # Initialize h as a k×omega zero matrix (each polynomial has omega coefficients)
-        h = [[0 for _ in range(self.N)] for _ in range(self.k)]
+        # every polynomial of h starts as an empty bitset, only the encoded positions are set.
+        h = [0] * self.k
         index = 0
 
         for i in range(self.k):
@@ -260,7 +263,7 @@ class Packing:
                         print("second")
                         return None
 
-                h[i][y[index]] = 1
+                h[i] |= 1 << y[index]
                 index = index + 1
 
         for i in range(index, self.omega):
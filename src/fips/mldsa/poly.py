@@ -0,0 +1,144 @@
+from array import array
+from typing import NamedTuple
+
+# the domains a PolyVec can be tagged with.
+COEFFICIENT_DOMAIN = "coefficient"
+NTT_DOMAIN = "ntt"
+
+class Poly(array):
+    """
+    A polynomial of R_q stored as a compact array of 256 signed 32-bit coefficients.
+
+    Behaves like a list of ints for indexing, iteration and comparison (a Poly compares
+    equal to a list or tuple with the same coefficients), but stores the coefficients
+    unboxed, about 1 KB per polynomial instead of about 9 KB for a list of Python ints.
+    """
+    __slots__ = ()
+
+    def __new__(cls, coefficients=()):
+        return super().__new__(cls, "i", coefficients)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and self.tolist() == list(other)
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __copy__(self):
+        return Poly(self)
+
+    def __deepcopy__(self, memo):
+        return Poly(self)
+
+    def __repr__(self):
+        return f"Poly({self.tolist()})"
+
+    def assign(self, coefficients):
+        """
+        Overwrites the coefficients in place, so that a preallocated Poly can be reused as
+        the output of a kernel. coefficients is a sequence or an iterator of len(self) ints.
+        A buffer of C ints (a Poly, an array("i") or an int32 numpy array) is copied as is.
+        Anything else, such as the map iterators the kernels return, is collected into one
+        unboxed array("i") as it is produced (no list, every int is freed as soon as it is
+        stored) and copied over, so it may read the coefficients it overwrites.
+        """
+        try:
+            source = memoryview(coefficients)
+        except TypeError:
+            source = None
+        if source is None or source.format != "i" or source.ndim != 1:
+            source = array("i", coefficients)
+        if len(source) != len(self):
+            raise ValueError(f"Expected {len(self)} coefficients, got {len(source)}")
+        memoryview(self)[:] = source
+
+class PolyVec(list):
+    """
+    A vector of polynomials, a list of Poly tagged with the domain it is in.
+
+    The domain is either COEFFICIENT_DOMAIN or NTT_DOMAIN. The NTT engine uses the tag to
+    transform a vector only when it is not already in the wanted domain, and trusts that
+    the elements of a PolyVec are Poly (integer coefficients) without scanning them.
+    """
+    __slots__ = ("domain",)
+
+    def __init__(self, polynomials=(), domain: str = COEFFICIENT_DOMAIN):
+        if domain not in (COEFFICIENT_DOMAIN, NTT_DOMAIN):
+            raise ValueError(f"domain must be {COEFFICIENT_DOMAIN!r} or {NTT_DOMAIN!r}, got {domain!r}")
+        super().__init__(p if isinstance(p, Poly) else Poly(p) for p in polynomials)
+        self.domain = domain
+
+    def __repr__(self):
+        return f"PolyVec({list.__repr__(self)}, domain={self.domain!r})"
+
+class PolyMatrix(list):
+    """
+    A matrix of polynomials, a list of PolyVec rows all tagged with the same domain.
+    """
+    __slots__ = ()
+
+    def __init__(self, rows=(), domain: str = COEFFICIENT_DOMAIN):
+        super().__init__(
+            row if isinstance(row, PolyVec) and row.domain == domain else PolyVec(row, domain)
+            for row in rows
+        )
+
+    @property
+    def domain(self) -> str:
+        return self[0].domain if self else COEFFICIENT_DOMAIN
+
+class StreamedMatrix:
+    """
+    A k x l matrix of polynomials that is never stored: every iteration over it calls row(r)
+    for r = 0 .. k - 1 and yields the rows as they are generated, so only one row is alive at
+    a time. Iterating twice generates the rows twice.
+    """
+    __slots__ = ("row", "k", "l", "domain")
+
+    def __init__(self, row, k: int, l: int, domain: str = COEFFICIENT_DOMAIN):
+        """
+        Args:
+            row (callable): row(r) returns row r of the matrix as a PolyVec of l polynomials.
+            k (int): number of rows.
+            l (int): number of columns.
+            domain (str): the domain of the rows.
+        """
+        self.row = row
+        self.k = k
+        self.l = l
+        self.domain = domain
+
+    def __len__(self) -> int:
+        return self.k
+
+    def __iter__(self):
+        return map(self.row, range(self.k))
+
+class SparsePoly(NamedTuple):
+    """
+    A polynomial with coefficients in {-1, 0, 1} given by its nonzero coefficients only, such
+    as the challenge c of SampleInBall: the positions in increasing order and the sign (1 or -1)
+    of the coefficient at each of them.
+    """
+    positions: tuple
+    signs: tuple
+
+def hint_indices(hint) -> list:
+    """
+    Returns the positions of the 1 coefficients of a hint polynomial, in increasing order.
+
+    A hint polynomial is either a bitset int, where bit j is coefficient j, or a list of
+    256 coefficients 0 or 1. For a bitset only the set bits are visited.
+    """
+    if isinstance(hint, int):
+        indices = []
+        while hint:
+            lowest = hint & -hint
+            indices.append(lowest.bit_length() - 1)
+            hint ^= lowest
+        return indices
+    return [j for j, bit in enumerate(hint) if bit]
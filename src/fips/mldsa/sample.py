@@ -1,11 +1,18 @@
-import hashlib
-import math
+from functools import partial
+from itertools import chain
 
 from .conversion import Conversion
 from .packing import Packing
+from .poly import Poly, PolyVec, PolyMatrix, StreamedMatrix, SparsePoly, NTT_DOMAIN
+from .xof import XOFReader
+
+try:
+    import numpy as np
+except ImportError: # numpy is an optional dependency.
+    np = None
 
 class Sample:
-    def __init__(self, eta, gamma1, k, l, _lambda_, tau, omega):
+    def __init__(self, eta, gamma1, k, l, _lambda_, tau, omega, validate: bool = True, use_numpy: bool = True):
         self.N = 256 # fixed for all 
         self.q = 8380417 # fixed for all
         
@@ -17,8 +24,20 @@ class Sample:
         self.tau = tau
         self.omega = omega
 
-        self.convert = Conversion()
-        self.packing = Packing(self.omega, self.k)
+        # when False the per-byte input checks of the coefficient samplers are skipped.
+        self.validate = validate
+
+        # the bulk samplers run on numpy when it is installed and not disabled.
+        self.use_numpy = use_numpy and np is not None
+
+        # for every byte z, the coefficients CoeffFromHalfByte accepts from z mod 16 and then z // 16.
+        self.bounded_table = tuple(
+            tuple(x for x in (self.CoeffFromHalfByte(z % 16), self.CoeffFromHalfByte(z // 16)) if x is not None)
+            for z in range(256)
+        )
+
+        self.convert = Conversion(validate)
+        self.packing = Packing(self.omega, self.k, validate)
         self.rejections = 0
 
     def CoeffFromThreeBytes(self, b0: int, b1: int, b2:int) -> int:
@@ -36,7 +55,7 @@ class Sample:
             TypeError: if any of b0, b1, b2 is not an integer
         """
         # checks for validity of inputs.
-        for i, b in enumerate((b0, b1, b2), start = 0):
+        for i, b in enumerate((b0, b1, b2) if self.validate else (), start = 0):
             if not isinstance(b, int):
                 raise TypeError (f"b{i} must be in an integer.")
             if not (0 <= b <= 255):
@@ -64,7 +83,7 @@ class Sample:
         Args:
             rho (bytes): a bytestring of length 34.
         Returns:
-            polynomial (list): a list of integers representing the polynomial.
+            polynomial (Poly): a polynomial representing the polynomial.
         raises:
             TypeError: if rho is not a bytestring.
             ValueError: if length of rho is not 34 bytes.    
@@ -75,53 +94,68 @@ class Sample:
         if not (len(rho) == 34):
             raise ValueError ("length of rho must be exatcly 34 bytes.")
 
-        # line 1: initialize j = 0 and the polynomial with all 0 coefficients.
-        j = 0
-        polynomial = [0 for _ in range (self.N)]
-
-        # line 2: initialize shake_128 ; G.init().
-        ctx = hashlib.shake_128() 
+        # line 1: initialize the polynomial without any coefficients.
+        polynomial = []
 
-        # line 3: hash rho with the shake_128 object ; # G.Abosrb(ctx, rho).
-        ctx.update(rho)
+        # line 2 and 3: initialize shake_128 and absorb rho ; G.init(), G.Absorb(ctx, rho).
+        # 5 blocks (840 bytes, 280 candidates) cover the 256 accepted samples nearly always.
+        ctx = XOFReader.shake_128(rho, 5 * 168)
+        length = 5 * 168
 
-        byte_stream = ctx.digest(894) # store the hash in byte_stream for faster calling.
-        byte_position = 0 # temprary variable to keep track of position in byte_stream.
-        
-        # line 4: main rejection loop.
-        while j < 256:
-            if byte_position + 3 > len(byte_stream): # to prevent byte_stream from going out of index.
-                byte_stream += ctx.digest(self.N)
-                print("ran out of bytes in rejection sampling! - max 894 bytes allowed")
-
-            # line 5: take out next 3 bytes form the hash ; G.squeeze(ctx, 3).
-            selected_3_bytes = byte_stream[byte_position : byte_position + 3]
-            byte_position +=3 # update byte position to get next 3 byte on next selection.
-
-            # line 6: sample an integer from 3 selected bytes.
-            polynomial[j] = self.CoeffFromThreeBytes(selected_3_bytes[0], selected_3_bytes[1], selected_3_bytes[2])
-            
-            # line 7 to 9: increment j if sample is accepted.
-            if polynomial[j] != None:
-                j = j + 1 # sample accepted.
+        # line 4 to 10: the rejection loop, run on a whole squeezed buffer of 3-byte groups at once:
+        # every group becomes a 23-bit candidate (CoeffFromThreeBytes) and the candidates >= q are dropped.
+        while len(polynomial) < self.N:
+            polynomial += self._coefficients_from_three_bytes(ctx.read(length))
+            length = 168 * 3 # a multiple of both the rate and of 3, so the groups stay aligned.
 
-        # line 11: return the constructed polynomial.
-        return polynomial
+        # line 11: return the constructed polynomial, the first 256 accepted samples.
+        return Poly(polynomial[:self.N])
 
-    def expand_A (self, rho: bytes) -> bytes:
+    def _coefficients_from_three_bytes(self, buffer: bytes) -> list:
+        """
+        CoeffFromThreeBytes applied to every 3-byte group of buffer, keeping only the accepted
+        coefficients, in order.
+        """
+        q = self.q
+        if self.use_numpy:
+            groups = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, 3).astype(np.int64)
+            z = groups[:, 0] | (groups[:, 1] << 8) | ((groups[:, 2] & 0x7F) << 16)
+            return z[z < q].tolist()
+
+        return [
+            z for b0, b1, b2 in zip(buffer[0::3], buffer[1::3], buffer[2::3])
+            if (z := b0 | (b1 << 8) | ((b2 & 0x7F) << 16)) < q
+        ]
+
+    def expand_A (self, rho: bytes, executor = None) -> bytes:
         """
         samples a k x l matrix of polynomials.
+
+        The k*l calls to RejNTTPoly only depend on rho, s and r, so with an executor they run as
+        independent jobs on the pool (one row of l polynomials per job on a process pool) and
+        the results are assembled in (r, s) order, the same matrix as the sequential loop.
         Args:
             rho (bytes): a bytestring of length 32.
+            executor (concurrent.futures.Executor): optional pool the polynomials are sampled on.
         Returns:
-            A (Matrix): a k x l matrix of polynomials.
+            A (PolyMatrix): a k x l matrix of polynomials in NTT domain.
         raises:
             ValueError: if length of rho is not 32 bytes.
         """
         #input checks.
-        if not (len(rho) == 32) and not isinstance(rho, bytes):
+        if not isinstance(rho, bytes) or len(rho) != 32:
             raise ValueError ("rho must be a 32-bytes bytestring.")
-        
+
+        if executor is not None:
+            # line 3 for every (r, s), in row-major order.
+            seeds = [
+                rho + self.convert.integer_to_bytes(s, 1) + self.convert.integer_to_bytes(r, 1)
+                for r in range(self.k) for s in range(self.l)
+            ]
+            # line 4: map keeps the order of the seeds whatever order the jobs finish in.
+            polynomials = iter(executor.map(self.RejNTTPoly, seeds, chunksize=self.l))
+            return PolyMatrix([[next(polynomials) for _ in range(self.l)] for _ in range(self.k)], NTT_DOMAIN)
+
         A = [[0 for _ in range(self.l)] for _ in range(self.k)] # initialize the matrix of polynomials with all 0s.
 
         # line 1 to 2: loop over k and then l. 
@@ -133,8 +167,39 @@ class Sample:
                 # line 4: construct a polynomial from rho_prime.
                 A[r][s] = self.RejNTTPoly(rho_prime)
         
-        return A # return the matrix A.        
+        return PolyMatrix(A, NTT_DOMAIN) # return the matrix A, sampled directly in NTT domain.        
     
+    def expand_A_row(self, rho: bytes, r: int) -> list:
+        """
+        samples row r of the k x l matrix of expand_A.
+        Args:
+            rho (bytes): a bytestring of length 32.
+            r (int): the index of the row, 0 <= r < k.
+        Returns:
+            row (PolyVec): the l polynomials A[r][0 .. l - 1] in NTT domain.
+        """
+        # line 2 to 4 for a single r.
+        return PolyVec(
+            (self.RejNTTPoly(rho + self.convert.integer_to_bytes(s, 1) + self.convert.integer_to_bytes(r, 1))
+             for s in range(self.l)),
+            NTT_DOMAIN,
+        )
+
+    def expand_A_streamed(self, rho: bytes) -> StreamedMatrix:
+        """
+        returns the matrix of expand_A as a StreamedMatrix, that samples each row when it is
+        iterated over instead of storing the matrix, for callers that trade time for memory.
+        Args:
+            rho (bytes): a bytestring of length 32.
+        Returns:
+            A (StreamedMatrix): a k x l matrix of polynomials in NTT domain.
+        raises:
+            ValueError: if length of rho is not 32 bytes.
+        """
+        if not isinstance(rho, bytes) or len(rho) != 32:
+            raise ValueError ("rho must be a 32-bytes bytestring.")
+        return StreamedMatrix(partial(self.expand_A_row, bytes(rho)), self.k, self.l, NTT_DOMAIN)
+
     def CoeffFromHalfByte(self, b: int) -> int:
         """
         generates an element of {-eta, -eta+1, ... , eta} U { None }
@@ -146,9 +211,10 @@ class Sample:
             TypeError: if b is not an integer.
             ValueError: if b is not in the range 0 - 15.
         """
-        if not isinstance(b, int):
+        if self.validate:
+            if not isinstance(b, int):
                 raise TypeError (f"{b} must be in an integer.")
-        if not (0 <= b <= 15):
+            if not (0 <= b <= 15):
                 raise ValueError (f"{b} must be in the range 0 - 15.")
 
         # line 1 and 2: rejection sampline from {-2, ... , 2 }
@@ -169,7 +235,7 @@ class Sample:
         Args:
             rho (bytes): a bytestring of length 66.
         Returns:
-            a (list): a list of integers representing the polynomial.
+            a (Poly): the sampled polynomial.
         Raises:
             TypeError: if rho is not a bytestring.
         """
@@ -179,46 +245,23 @@ class Sample:
         if not (len(rho) == 66):
             raise ValueError ("length of rho must be exatcly 66 bytes.")
         
-        # line 1: initialize j and polynomial a.
-        j = 0
-        a = [0 for _ in range(self.N)]
-
-        # line 2: initialize shake_256 ; H.init().
-        ctx = hashlib.shake_256() # H.init()
+        # line 1: initialize the polynomial a without any coefficients.
+        a = []
 
-        # line 3: hash rho with the shake_256 object ; # H.Abosrb(ctx, rho).
-        ctx.update(rho) # H.Abosrb(ctx, rho)
+        # line 2 and 3: initialize shake_256 and absorb rho ; H.init(), H.Absorb(ctx, rho).
+        # 2 blocks (272 bytes) cover the about 137 (eta = 2) or 228 (eta = 4) bytes needed on average.
+        ctx = XOFReader.shake_256(rho, 2 * 136)
+        length = 2 * 136
 
-        byte_stream = ctx.digest(self.N) # store the hash in byte_stream for faster calling.
-        byte_position = 0 # temprary variable to keep track of position in byte_stream.
+        # line 4 to 16: the rejection loop, run on a whole squeezed buffer at once: every byte z is
+        # replaced by the coefficients accepted from its two half bytes, looked up in bounded_table.
+        table = self.bounded_table
+        while len(a) < self.N:
+            a += chain.from_iterable(map(table.__getitem__, ctx.read(length)))
+            length = 136
 
-        # line 4: main rejection loop.
-        while j < 256:
-            if byte_position + 1 > len(byte_stream): # to prevent byte_stream from going out of index.
-                byte_stream += ctx.digest(self.N)
-            
-            # line 5: take out next byte form the hash ; H.squeeze(ctx, 1).
-            z = byte_stream[byte_position]
-            byte_position += 1 # update byte position go get next byte on next selection.
-
-            # line 6: sample a number from z.
-            z0 = self.CoeffFromHalfByte(z % 16)
-
-            # line 7: sample a number from z / 16 (floor).
-            z1 = self.CoeffFromHalfByte(math.floor(z / 16))
-            
-            # line 8 to 11: rejection checking for z0.
-            if z0 != None:
-                a[j] = z0 # accepted.
-                j = j + 1
-
-            # line 12 to 15: rejection checking for z1.
-            if z1 != None and j < 256:
-                a[j] = z1 # accepted.
-                j = j + 1
-        
-        # line 17: return the polynomial a.
-        return a
+        # line 17: return the polynomial a, the first 256 accepted coefficients.
+        return Poly(a[:self.N])
 
     def expand_S (self, rho: bytes) -> tuple[list, list]:
         """
@@ -226,8 +269,8 @@ class Sample:
         Args:
             rho (bytes): a bytestring of length 64.
         Returns:
-            s1 (list): a list of l polynomials representing the vector s1.
-            s2 (list): a list of k polynomials representing the vector s2.
+            s1 (PolyVec): a vector of l polynomials representing the vector s1.
+            s2 (PolyVec): a vector of k polynomials representing the vector s2.
         Raises:
             ValueError: if length of rho is not 64 bytes.
         """
@@ -248,7 +291,7 @@ class Sample:
             s2[s] = self.RejBoundedPoly(rho + self.convert.integer_to_bytes(s + self.l, 2))
 
         # line 7: return s1 and s2 polynomail vectors.
-        return (s1, s2)
+        return (PolyVec(s1), PolyVec(s2))
     
     def expand_mask(self, rho: bytes, mew: int):
         """
@@ -257,7 +300,7 @@ class Sample:
             rho (bytes): a bytestring of length 64.
             mew (int): an integer used in the sampling process.
         Returns:
-            y (list): a list of polynomials representing the vector y.
+            y (PolyVec): a vector of l polynomials representing the vector y.
         Raises:
             ValueError: if length of rho is not 64 bytes.
             TypeError: if mew is not an integer.
@@ -284,7 +327,7 @@ class Sample:
             v = self.convert.H(rho_prime, total_bytes)
             y[r] = self.packing.bit_unpack(v, self.gamma1 - 1, self.gamma1)
             
-        return y
+        return PolyVec(y)
 
     def SampleInBall(self, rho: bytes) -> list:
         """
@@ -292,7 +335,22 @@ class Sample:
         Args:
             rho (bytes): a bytestring of length lambda / 4 bits.
         Returns:
-            c (list): a list of integers representing the polynomial.
+            c (Poly): the sampled polynomial.
+        Raises:
+            ValueError: if length of rho is not lambda / 4 bits.
+            TypeError: if rho is not a bytestring.
+        """
+        return self.challenge(rho)[0]
+
+    def challenge(self, rho: bytes) -> tuple[Poly, SparsePoly]:
+        """
+        Algorithm 29 FIPS 204 (SampleInBall), returning the challenge both as a dense polynomial
+        and as its tau nonzero coefficients, the form the sparse multiplication kernels take.
+        Args:
+            rho (bytes): a bytestring of length lambda / 4 bits.
+        Returns:
+            c (Poly): the sampled polynomial.
+            c_sparse (SparsePoly): the positions and signs of the nonzero coefficients of c.
         Raises:
             ValueError: if length of rho is not lambda / 4 bits.
             TypeError: if rho is not a bytestring.
@@ -303,33 +361,26 @@ class Sample:
             raise ValueError (f"value of rho must be exatcly {int(self._lambda_ / 4)} bits")
         
         c = [0 for _ in range(self.N)]
-        ctx = hashlib.shake_256() # H.init()
-        ctx.update(rho) # H.Abosrb(ctx, rho)
 
-        search_multiplier = 1
-        byte_stream = ctx.digest(self.N * search_multiplier) # the amount that we should digest is arbitrary here but will cause differences 
+        # H.init(), H.Absorb(ctx, rho), one block covers the 8 sign bytes and the about tau positions.
+        ctx = XOFReader.shake_256(rho, 136)
 
-        h = self.convert.bytes_to_bits(byte_stream[:8])
+        # the 64 sign bits as one integer, bit k is h[k] (BytesToBits is little-endian).
+        h = int.from_bytes(ctx.read(8), "little")
 
-        byte_position = 8
+        stream = iter(ctx)
         for i in range(256 - self.tau, 256):
-            j = byte_stream[byte_position]
-            byte_position = byte_position + 1
+            j = next(stream)
 
             while j > i:
-                if byte_position + 1 > len(byte_stream): # to prevent byte_stream from going out of index.
-                    search_multiplier = search_multiplier + 1
-                    byte_stream = ctx.digest(self.N * search_multiplier)
-                j = byte_stream[byte_position]
-                byte_position = byte_position + 1
+                j = next(stream)
             
             c[i] = c[j]
-            if int(h[i + self.tau - 256]) == 1: # taking this as equivalent to being (-1)^h[i+tau-256]
-                c[j] = -1
-            else:
-                c[j] = 1
-        
-        return c
+            # (-1)^h[i+tau-256]
+            c[j] = -1 if (h >> (i + self.tau - 256)) & 1 else 1
+
+        positions = tuple(i for i, x in enumerate(c) if x)
+        return Poly(c), SparsePoly(positions, tuple(c[i] for i in positions))
 
     
 
@@ -0,0 +1,57 @@
+import threading
+
+from .poly import Poly, PolyVec
+
+# one arena per thread and (k, l), so concurrent signing never shares buffers.
+_thread_arenas = threading.local()
+
+class SignScratch:
+    """
+    Preallocated buffers for the rejection loop of ml_dsa_sign_internal.
+
+    Every iteration of the loop writes its intermediate vectors into the same buffers
+    through the out parameters of the NTT and Operations kernels, so the number of live
+    polynomials stays flat however many iterations a signature needs. An arena must only
+    be used by one signing call at a time, use for_thread to get one per thread.
+    """
+    __slots__ = (
+        "k", "l",
+        "y_ntt", "w", "w_1",
+        "product_c_s1", "product_c_s2", "product_c_t0",
+        "z",
+    )
+
+    def __init__(self, k: int, l: int, N: int = 256):
+        """
+        Args:
+            k (int): number of rows of the matrix A.
+            l (int): number of columns of the matrix A.
+            N (int): number of coefficients of a polynomial.
+        """
+        self.k = k
+        self.l = l
+
+        def vector(length):
+            return PolyVec(Poly(bytes(4 * N)) for _ in range(length))
+
+        self.y_ntt = vector(l)              # NTT(y)
+        self.w = vector(k)                  # A.y
+        self.w_1 = vector(k)                # HighBits(w)
+        self.product_c_s1 = vector(l)       # c.s1
+        self.product_c_s2 = vector(k)       # c.s2
+        self.product_c_t0 = vector(k)       # c.t0
+        self.z = vector(l)                  # y + c.s1, once accepted
+
+    @classmethod
+    def for_thread(cls, k: int, l: int) -> "SignScratch":
+        """
+        Returns the arena of the calling thread for the dimensions (k, l), creating it on
+        first use.
+        """
+        arenas = getattr(_thread_arenas, "arenas", None)
+        if arenas is None:
+            arenas = _thread_arenas.arenas = {}
+        arena = arenas.get((k, l))
+        if arena is None:
+            arena = arenas[(k, l)] = cls(k, l)
+        return arena
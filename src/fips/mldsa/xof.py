@@ -0,0 +1,72 @@
+import hashlib
+
+class XOFReader:
+    """
+    Reads the output stream of a SHAKE extendable output function sequentially.
+
+    hashlib can only squeeze from the start of the stream, digest(n) returns its first n
+    bytes. The reader keeps the absorbed state and squeezes whole blocks of the rate
+    (168 bytes for SHAKE128, 136 for SHAKE256) ahead of a cursor. When the cursor reaches
+    the end of what was squeezed, the stream is squeezed again with at least twice the
+    length, so every read continues the stream where the previous one stopped and the
+    total work stays within about twice the bytes actually read.
+    """
+    __slots__ = ("_ctx", "_rate", "_buffer", "_position")
+
+    def __init__(self, ctx, initial: int = 0):
+        """
+        Args:
+            ctx: a hashlib shake_128 or shake_256 object that has absorbed its whole input.
+            initial (int): number of bytes expected to be read, squeezed up front (rounded
+                up to whole blocks, at least one).
+        """
+        self._ctx = ctx
+        self._rate = ctx.block_size
+        self._buffer = b""
+        self._position = 0
+        self._squeeze(max(initial, 1))
+
+    @classmethod
+    def shake_128(cls, data: bytes, initial: int = 0) -> "XOFReader":
+        """
+        Returns a reader over SHAKE128(data) ; G.init(), G.absorb(data).
+        """
+        return cls(hashlib.shake_128(data), initial)
+
+    @classmethod
+    def shake_256(cls, data: bytes, initial: int = 0) -> "XOFReader":
+        """
+        Returns a reader over SHAKE256(data) ; H.init(), H.absorb(data).
+        """
+        return cls(hashlib.shake_256(data), initial)
+
+    def _squeeze(self, minimum: int):
+        """
+        Squeezes at least minimum bytes, and at least twice as many as before, in whole blocks.
+        """
+        length = max(minimum, 2 * len(self._buffer))
+        length = -(-length // self._rate) * self._rate
+        self._buffer = self._ctx.digest(length)
+
+    def read(self, n: int) -> bytes:
+        """
+        Returns the next n bytes of the stream ; squeeze(ctx, n).
+        """
+        end = self._position + n
+        if end > len(self._buffer):
+            self._squeeze(end)
+        output = self._buffer[self._position:end]
+        self._position = end
+        return output
+
+    def __iter__(self):
+        """
+        Yields the following bytes of the stream one at a time as ints, without end. The
+        cursor moves with every byte yielded, so reads can be mixed with iteration.
+        """
+        while True:
+            position = self._position
+            if position >= len(self._buffer):
+                self._squeeze(position + 1)
+            self._position = position + 1
+            yield self._buffer[position]
@@ -0,0 +1,68 @@
+# microbenchmark of the polynomial multiplication engines on the A . y product of signing.
+#   ntt (radix 4 / radix 2): NTT(y), pointwise multiply-accumulate with A_hat, inverse NTT.
+#   kronecker:               A and y in coefficient domain, one big integer product per entry.
+#
+# Kronecker substitution packs each polynomial into one integer with a 64-bit lane per
+# coefficient, so a single big integer multiplication gives the full product, which is folded
+# mod X^256 + 1 (the upper 256 lanes are subtracted from the lower ones). It is slower than
+# the NTT here and ExpandA samples A in NTT domain, so it is kept out of the library.
+import secrets
+import sys
+import timeit
+from array import array
+
+from fips.mldsa import MLDSA_128, MLDSA_192, MLDSA_256, Poly, PolyVec
+from fips.mldsa.ntt import NTT
+
+repeat = 5
+number = 20
+
+N = 256
+q = 8380417
+
+ntt_radix4 = NTT(use_numpy=False, radix=4)
+ntt_radix2 = NTT(use_numpy=False, radix=2)
+
+def kronecker_pack(poly) -> int:
+    # a sum of up to 256 products of polynomials reduced into [0, q - 1] stays below 2^64 in every lane.
+    lanes = array("Q", map(q.__rmod__, poly))
+    if sys.byteorder == "big":
+        lanes.byteswap()
+    return int.from_bytes(lanes.tobytes(), "little")
+
+def kronecker_unpack(value: int) -> Poly:
+    lanes = array("Q")
+    lanes.frombytes(value.to_bytes(8 * 2 * N, "little"))
+    if sys.byteorder == "big":
+        lanes.byteswap()
+    return Poly((low - high) % q for low, high in zip(lanes[:N], lanes[N:]))
+
+def kronecker_product(A, y):
+    # the products of a row are summed as integers and folded once.
+    packed_y = [kronecker_pack(p) for p in y]
+    return PolyVec(
+        kronecker_unpack(sum(kronecker_pack(a) * b for a, b in zip(row, packed_y)))
+        for row in A
+    )
+
+def ntt_product(ntt, A_hat, y):
+    return ntt.inv_NTT_vec(ntt.multiply_matrix_vector(A_hat, ntt.NTT_vec(y)))
+
+for name, fips in (("ML-DSA-44", MLDSA_128), ("ML-DSA-65", MLDSA_192), ("ML-DSA-87", MLDSA_256)):
+    A_hat = fips.sample.expand_A(secrets.token_bytes(32))
+    A = [ntt_radix4.inv_NTT_vec(row) for row in A_hat] # the same matrix in coefficient domain.
+    y = fips.sample.expand_mask(secrets.token_bytes(64), 0)
+
+    expected = ntt_product(ntt_radix4, A_hat, y)
+    if kronecker_product(A, y) != expected:
+        raise AssertionError(f"{name}: kronecker product differs from the ntt product")
+
+    print(f"--- {name} (k = {fips.k}, l = {fips.l}) ---")
+    engines = (
+        ("ntt (radix 4)", lambda: ntt_product(ntt_radix4, A_hat, y)),
+        ("ntt (radix 2)", lambda: ntt_product(ntt_radix2, A_hat, y)),
+        ("kronecker", lambda: kronecker_product(A, y)),
+    )
+    for engine, run in engines:
+        elapsed = min(timeit.repeat(run, number=number, repeat=repeat)) / number
+        print(f"  {engine:<15} {elapsed * 1000:8.3f} ms per A . y")
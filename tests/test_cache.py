@@ -0,0 +1,112 @@
+import unittest
+import pickle
+import secrets
+import threading
+from fips.mldsa import MLDSA_128, MatrixCache
+from fips.mldsa.ml_dsa import MLDSA
+from fips.mldsa.default_parameters import DEFAULT_PARAMETERS
+
+
+class TestMatrixCache(unittest.TestCase):
+    """
+    Test the LRU cache of expanded matrices.
+    """
+
+    def setUp(self):
+        self.sample = MLDSA_128.sample
+        self.k = MLDSA_128.k
+        self.l = MLDSA_128.l
+        self.size = MatrixCache._size(self.sample.expand_A(bytes(32)))
+
+    def test_hits_and_misses(self):
+        cache = MatrixCache()
+        rho = secrets.token_bytes(32)
+        first = cache.get(rho, self.k, self.l, self.sample.expand_A)
+        self.assertEqual(first, self.sample.expand_A(rho))
+        self.assertIs(cache.get(rho, self.k, self.l, self.sample.expand_A), first)
+        # the dimensions are part of the key.
+        self.assertIsNot(cache.get(rho, self.k, self.l + 1, self.sample.expand_A), first)
+        self.assertEqual(cache.stats(), {
+            "hits": 1, "misses": 2, "evictions": 0,
+            "entries": 2, "bytes": 2 * self.size, "max_bytes": cache.max_bytes,
+        })
+
+    def test_lru_eviction(self):
+        cache = MatrixCache(max_bytes=2 * self.size)
+        a, b, c = (bytes([i]) * 32 for i in range(3))
+        cache.get(a, self.k, self.l, self.sample.expand_A)
+        cache.get(b, self.k, self.l, self.sample.expand_A)
+        cache.get(a, self.k, self.l, self.sample.expand_A)
+        # b is the least recently used.
+        cache.get(c, self.k, self.l, self.sample.expand_A)
+        self.assertEqual((len(cache), cache.evictions, cache.current_bytes), (2, 1, 2 * self.size))
+        cache.get(a, self.k, self.l, self.sample.expand_A)
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+        cache.get(b, self.k, self.l, self.sample.expand_A)
+        self.assertEqual((cache.misses, cache.evictions), (4, 2))
+
+    def test_larger_than_budget(self):
+        cache = MatrixCache(max_bytes=self.size - 1)
+        rho = secrets.token_bytes(32)
+        self.assertEqual(cache.get(rho, self.k, self.l, self.sample.expand_A), self.sample.expand_A(rho))
+        self.assertEqual((len(cache), cache.current_bytes, cache.evictions), (0, 0, 0))
+
+    def test_clear(self):
+        cache = MatrixCache()
+        cache.get(bytes(32), self.k, self.l, self.sample.expand_A)
+        cache.clear()
+        self.assertEqual((len(cache), cache.current_bytes, cache.misses), (0, 0, 1))
+
+    def test_threads(self):
+        cache = MatrixCache(max_bytes=3 * self.size)
+        seeds = [bytes([i]) * 32 for i in range(4)]
+        expected = {rho: self.sample.expand_A(rho) for rho in seeds}
+        errors = []
+
+        def worker(offset):
+            for i in range(8):
+                rho = seeds[(i + offset) % len(seeds)]
+                if cache.get(rho, self.k, self.l, self.sample.expand_A) != expected[rho]:
+                    errors.append(rho)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(cache.hits + cache.misses, 32)
+        self.assertLessEqual(cache.current_bytes, cache.max_bytes)
+        self.assertEqual(cache.current_bytes, len(cache) * self.size)
+
+    def test_invalid_budget(self):
+        self.assertRaises(ValueError, MatrixCache, 0)
+        self.assertRaises(ValueError, MatrixCache, 1.5)
+
+
+class TestMLDSAMatrixCache(unittest.TestCase):
+    """
+    Test that signing and verifying through a matrix cache gives the same results.
+    """
+
+    def test_sign_and_verify(self):
+        cache = MatrixCache()
+        ML_DSA = MLDSA(DEFAULT_PARAMETERS["MLDSA_128"], matrix_cache=cache)
+        seed = secrets.token_bytes(32)
+        pk, sk = ML_DSA.ml_dsa_keygen_internal(seed)
+        self.assertEqual((pk, sk), MLDSA_128.ml_dsa_keygen_internal(seed))
+        for _ in range(2):
+            msg = secrets.token_bytes(32)
+            rnd = secrets.token_bytes(32)
+            sig = ML_DSA.ml_dsa_sign_internal(sk, msg, rnd)
+            self.assertEqual(sig, MLDSA_128.ml_dsa_sign_internal(sk, msg, rnd))
+            self.assertTrue(ML_DSA.ml_dsa_verify_internal(pk, ML_DSA.convert.bytes_to_bits(msg), sig))
+        self.assertEqual((cache.misses, cache.hits), (1, 4))
+
+        # a pickled copy does not carry the cache along.
+        self.assertIsNone(pickle.loads(pickle.dumps(ML_DSA)).matrix_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
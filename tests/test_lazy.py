@@ -0,0 +1,64 @@
+import unittest
+import random
+from fips.mldsa.ntt import NTT
+from fips.mldsa.operation import Operations
+from fips.mldsa.poly import PolyVec, NTT_DOMAIN
+
+
+class TestLazyVector(unittest.TestCase):
+    """
+    Test the fused lazy expressions against the eager vector helpers.
+    """
+
+    def setUp(self):
+        self.ntt = NTT()
+        self.q = self.ntt.q
+        self.a = PolyVec([[random.randint(0, self.q - 1) for _ in range(256)] for _ in range(3)])
+        self.b = PolyVec([[random.randint(-(1 << 19), 1 << 19) for _ in range(256)] for _ in range(3)])
+
+    def test_arithmetic(self):
+        a = self.ntt.lazy(self.a)
+        b = self.ntt.lazy(self.b)
+        self.assertEqual((a + b).evaluate(), self.ntt.AddPolynomialVectors(self.a, self.b))
+        self.assertEqual((a - b).evaluate(), self.ntt.SubPolynomialVectors(self.a, self.b))
+        self.assertEqual((-b).evaluate(), self.ntt.multiply_scalar_vector(-1, self.b))
+        self.assertEqual((3 * a - b * 2).evaluate(), self.ntt.SubPolynomialVectors(
+            self.ntt.multiply_scalar_vector(3, self.a), self.ntt.multiply_scalar_vector(2, self.b)))
+
+    def test_map_and_norm(self):
+        operation = Operations(261888)
+        difference = self.ntt.lazy(self.a) - self.ntt.lazy(self.b)
+        eager = self.ntt.SubPolynomialVectors(self.a, self.b)
+
+        low_bits = difference.map(operation.lowBits)
+        self.assertEqual(low_bits.evaluate(), [[operation.lowBits(x) for x in p] for p in eager])
+        self.assertEqual(low_bits.infinity_norm(), max(abs(operation.lowBits(x)) for p in eager for x in p))
+        self.assertEqual(self.ntt.lazy(self.b).infinity_norm(), max(abs(x) for p in self.b for x in p))
+
+        hints = (-self.ntt.lazy(self.b)).map(operation.make_hint, difference)
+        self.assertEqual(hints.evaluate(out=[[0] * 256 for _ in range(3)]),
+            [[operation.make_hint((-y) % self.q, x) for x, y in zip(p, r)] for p, r in zip(eager, self.b)])
+
+    def test_row_norm_reads_operands_late(self):
+        buffer = PolyVec([[0] * 256 for _ in range(3)])
+        expression = self.ntt.lazy(self.b) + self.ntt.lazy(buffer)
+        self.assertEqual(expression.row_infinity_norm(1), max(abs(x) for x in self.b[1]))
+        buffer[1].assign([1 << 20] * 256)
+        self.assertEqual(expression.row_infinity_norm(1), max(abs(x + (1 << 20)) for x in self.b[1]))
+        self.assertEqual(expression.infinity_norm(), max(expression.row_infinity_norm(i) for i in range(3)))
+
+    def test_evaluate_in_place(self):
+        out = PolyVec([list(p) for p in self.a])
+        first = out[0]
+        (self.ntt.lazy(out) + self.ntt.lazy(self.b)).evaluate(out=out)
+        self.assertIs(out[0], first)
+        self.assertEqual(out, self.ntt.AddPolynomialVectors(self.a, self.b))
+
+    def test_incompatible_operands(self):
+        a = self.ntt.lazy(self.a)
+        self.assertRaises(ValueError, lambda: a + self.ntt.lazy(self.b[:2]))
+        self.assertRaises(ValueError, lambda: a + self.ntt.lazy(PolyVec(self.b, NTT_DOMAIN)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,12 @@
 import unittest
 import json
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 import secrets
 import random
 from fips.mldsa import MLDSA_128, MLDSA_192, MLDSA_256
+from fips.mldsa.ml_dsa import MLDSA
+from fips.mldsa.default_parameters import DEFAULT_PARAMETERS
 
 
 class TestMLDSA(unittest.TestCase):
@@ -399,3 +403,110 @@ class TestML_DSA_KAT(unittest.TestCase):
 
     def test_ML_DSA_87_verify(self):
         self.generic_verify_kat(MLDSA_256, 2)
+
+class TestMLDSAValidation(unittest.TestCase):
+    """
+    Test that checking inputs only at the entry points gives the same results
+    as checking them everywhere.
+    """
+
+    def test_boundary_matches_full(self):
+        ML_DSA = MLDSA(DEFAULT_PARAMETERS["MLDSA_192"], validation="boundary")
+        seed = secrets.token_bytes(32)
+        rnd = secrets.token_bytes(32)
+        msg = ML_DSA.convert.bytes_to_bits(secrets.token_bytes(64))
+
+        pk, sk = ML_DSA.ml_dsa_keygen_internal(seed)
+        self.assertEqual((pk, sk), MLDSA_192.ml_dsa_keygen_internal(seed))
+
+        sig = ML_DSA.ml_dsa_sign_internal(sk, msg, rnd)
+        self.assertEqual(sig, MLDSA_192.ml_dsa_sign_internal(sk, msg, rnd))
+        self.assertTrue(ML_DSA.ml_dsa_verify_internal(pk, msg, sig))
+
+    def test_entry_points_still_validate(self):
+        ML_DSA = MLDSA(DEFAULT_PARAMETERS["MLDSA_128"], validation="boundary")
+        self.assertRaises(ValueError, ML_DSA.ml_dsa_keygen_internal, bytes(31))
+        self.assertRaises(ValueError, ML_DSA.ml_dsa_sign, bytes(10), "01", b"")
+        self.assertRaises(ValueError, MLDSA, DEFAULT_PARAMETERS["MLDSA_128"], validation="none")
+
+
+class TestMLDSAMessagePrefix(unittest.TestCase):
+    """
+    Test that hashing M' from a cached prefix state gives the hash of the concatenation.
+    """
+
+    def test_h_prefixed(self):
+        convert = MLDSA_128.convert
+        prefix = secrets.token_bytes(80)
+        for length in (0, 1, 200):
+            message = secrets.token_bytes(length)
+            self.assertEqual(convert.H_prefixed(prefix, message, 64), convert.H(prefix + message, 64))
+            self.assertEqual(convert.H_prefixed(prefix, message, 64), convert.H(prefix + message, 64))
+        self.assertRaises(TypeError, convert.H_prefixed, "prefix", b"", 64)
+
+    def test_h_public_key_prefixed(self):
+        convert = MLDSA_128.convert
+        public_key = secrets.token_bytes(1312)
+        tr = convert.H(public_key, 64)
+        for prefix in (b"", b"\x00\x03ctx"):
+            message = secrets.token_bytes(33)
+            for _ in range(2):
+                self.assertEqual(convert.H_public_key_prefixed(public_key, prefix, message, 64),
+                    convert.H(tr + prefix + message, 64))
+
+    def test_sign_and_verify_with_prefix(self):
+        pk, sk = MLDSA_128.ml_dsa_keygen_internal(secrets.token_bytes(32))
+        prefix = b"\x00\x07context"
+        msg = secrets.token_bytes(40)
+        rnd = secrets.token_bytes(32)
+        sig = MLDSA_128.ml_dsa_sign_internal(sk, msg, rnd, prefix)
+        self.assertEqual(sig, MLDSA_128.ml_dsa_sign_internal(sk, prefix + msg, rnd))
+        bits = MLDSA_128.convert.bytes_to_bits
+        self.assertTrue(MLDSA_128.ml_dsa_verify_internal(pk, bits(msg), sig, prefix))
+        self.assertTrue(MLDSA_128.ml_dsa_verify_internal(pk, bits(prefix + msg), sig))
+        self.assertFalse(MLDSA_128.ml_dsa_verify_internal(pk, bits(msg), sig, b"\x00\x07contexT"))
+
+
+class TestMLDSASpeculativeSigning(unittest.TestCase):
+    """
+    Test that evaluating several kappa candidates at once gives the sequential signature, and
+    that expanding A on a pool or streaming it gives the sequential results.
+    """
+
+    def test_matches_sequential(self):
+        pk, sk = MLDSA_192.ml_dsa_keygen_internal(secrets.token_bytes(32))
+        with ThreadPoolExecutor(3) as executor:
+            ML_DSA = MLDSA(DEFAULT_PARAMETERS["MLDSA_192"], sign_executor=executor, sign_candidates=3)
+            for _ in range(3):
+                msg = secrets.token_bytes(32)
+                rnd = secrets.token_bytes(32)
+                sig = ML_DSA.ml_dsa_sign_internal(sk, msg, rnd)
+                self.assertEqual(sig, MLDSA_192.ml_dsa_sign_internal(sk, msg, rnd))
+                self.assertTrue(MLDSA_192.ml_dsa_verify_internal(pk, MLDSA_192.convert.bytes_to_bits(msg), sig))
+
+            # a copy sent to a process pool does not carry the executor along.
+            self.assertIsNone(pickle.loads(pickle.dumps(ML_DSA)).sign_executor)
+
+    def test_expand_executor(self):
+        seed = secrets.token_bytes(32)
+        with ThreadPoolExecutor(2) as executor:
+            ML_DSA = MLDSA(DEFAULT_PARAMETERS["MLDSA_128"], expand_executor=executor)
+            pk, sk = ML_DSA.ml_dsa_keygen_internal(seed)
+            self.assertEqual((pk, sk), MLDSA_128.ml_dsa_keygen_internal(seed))
+            self.assertIsNone(pickle.loads(pickle.dumps(ML_DSA)).expand_executor)
+
+    def test_low_memory(self):
+        seed = secrets.token_bytes(32)
+        ML_DSA = MLDSA(DEFAULT_PARAMETERS["MLDSA_128"], low_memory=True)
+        pk, sk = ML_DSA.ml_dsa_keygen_internal(seed)
+        self.assertEqual((pk, sk), MLDSA_128.ml_dsa_keygen_internal(seed))
+        msg = secrets.token_bytes(32)
+        rnd = secrets.token_bytes(32)
+        sig = ML_DSA.ml_dsa_sign_internal(sk, msg, rnd)
+        self.assertEqual(sig, MLDSA_128.ml_dsa_sign_internal(sk, msg, rnd))
+        self.assertTrue(ML_DSA.ml_dsa_verify_internal(pk, ML_DSA.convert.bytes_to_bits(msg), sig))
+        with ThreadPoolExecutor(1) as executor:
+            self.assertRaises(ValueError, MLDSA, DEFAULT_PARAMETERS["MLDSA_128"], low_memory=True, expand_executor=executor)
+
+    def test_invalid_candidates(self):
+        self.assertRaises(ValueError, MLDSA, DEFAULT_PARAMETERS["MLDSA_128"], sign_candidates=0)
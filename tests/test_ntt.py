@@ -0,0 +1,137 @@
+import unittest
+import random
+from fips.mldsa.ntt import NTT
+from fips.mldsa.poly import Poly, PolyVec, COEFFICIENT_DOMAIN, NTT_DOMAIN
+
+
+def schoolbook_multiply(a, b, q=8380417):
+    """
+    Reference negacyclic product of two polynomials in Zq[X]/(X^256 + 1).
+    """
+    c = [0] * 256
+    for i in range(256):
+        for j in range(256):
+            if i + j < 256:
+                c[i + j] += a[i] * b[j]
+            else:
+                c[i + j - 256] -= a[i] * b[j]
+    return [x % q for x in c]
+
+
+class TestNTT(unittest.TestCase):
+    """
+    Test the NTT engine against the schoolbook negacyclic product.
+    """
+
+    def setUp(self):
+        self.ntt = NTT()
+        self.q = self.ntt.q
+
+    def random_poly(self, low=0, high=8380416):
+        return [random.randint(low, high) for _ in range(256)]
+
+    def test_round_trip(self):
+        for low, high in ((0, self.q - 1), (-4, 4), (-(1 << 19), 1 << 19)):
+            poly = self.random_poly(low, high)
+            self.assertEqual(self.ntt.inv_NTT(self.ntt.NTT(poly)), [x % self.q for x in poly])
+
+    def test_inputs_are_not_modified(self):
+        poly = self.random_poly()
+        copy = list(poly)
+        self.ntt.NTT(poly)
+        self.ntt.inv_NTT(poly)
+        self.assertEqual(poly, copy)
+
+    def test_radix2_matches_radix4(self):
+        radix2 = NTT(radix=2)
+        for low, high in ((0, self.q - 1), (-self.q, 2 * self.q)):
+            poly = self.random_poly(low, high)
+            self.assertEqual(radix2.NTT(poly), self.ntt.NTT(poly))
+            self.assertEqual(radix2.inv_NTT(poly), self.ntt.inv_NTT(poly))
+
+    def test_multiplication(self):
+        a = self.random_poly()
+        b = self.random_poly(-2, 2)
+        product = self.ntt.inv_NTT(self.ntt.MultiplyNTT(self.ntt.NTT(a), self.ntt.NTT(b)))
+        self.assertEqual(product, schoolbook_multiply(a, b))
+
+    def test_sparse_multiply(self):
+        c = [0] * 256
+        for i in random.sample(range(256), 60):
+            c[i] = random.choice((-1, 1))
+        vector = [self.random_poly(-4, 4), self.random_poly()]
+        self.assertEqual(self.ntt.sparse_multiply_vector(c, vector), [schoolbook_multiply(c, p) for p in vector])
+        self.assertEqual(self.ntt.sparse_multiply(c, vector[1]), schoolbook_multiply(c, vector[1]))
+
+    def test_multiply_matrix_vector(self):
+        matrix = [[self.random_poly() for _ in range(5)] for _ in range(6)]
+        vector = [self.random_poly() for _ in range(5)]
+        expected = []
+        for row in matrix:
+            accumulator = [0] * 256
+            for a, b in zip(row, vector):
+                accumulator = self.ntt.AddNTT(accumulator, self.ntt.MultiplyNTT(a, b))
+            expected.append(accumulator)
+        self.assertEqual(self.ntt.multiply_matrix_vector(matrix, vector), expected)
+
+    def test_vector_transforms(self):
+        vector = [self.random_poly(-(1 << 19), 1 << 19) for _ in range(7)]
+        vector_ntt = self.ntt.NTT_vec(vector)
+        self.assertEqual(vector_ntt, [self.ntt.NTT(p) for p in vector])
+        self.assertEqual(self.ntt.inv_NTT_vec(vector_ntt), [self.ntt.inv_NTT(p) for p in vector_ntt])
+
+    def test_vector_transforms_without_numpy(self):
+        ntt = NTT(use_numpy=False)
+        vector = [self.random_poly() for _ in range(3)]
+        self.assertEqual(ntt.NTT_vec(vector), self.ntt.NTT_vec(vector))
+        self.assertEqual(ntt.inv_NTT_vec(vector), self.ntt.inv_NTT_vec(vector))
+
+    def test_domain_tags(self):
+        vector = PolyVec([self.random_poly() for _ in range(3)])
+        self.assertEqual(vector.domain, COEFFICIENT_DOMAIN)
+
+        vector_ntt = self.ntt.to_ntt(vector)
+        self.assertEqual(vector_ntt.domain, NTT_DOMAIN)
+        self.assertIs(self.ntt.to_ntt(vector_ntt), vector_ntt)
+        self.assertIs(self.ntt.to_coefficients(vector), vector)
+        self.assertEqual(self.ntt.to_coefficients(vector_ntt), vector)
+        self.assertRaises(ValueError, self.ntt.NTT_vec, vector_ntt)
+        self.assertRaises(ValueError, self.ntt.AddPolynomialVectors, vector, vector_ntt)
+        self.assertRaises(ValueError, self.ntt.sparse_multiply_vector, [0] * 256, vector_ntt)
+
+    def test_products_transform_coefficient_vectors(self):
+        matrix = [self.ntt.NTT_vec([self.random_poly() for _ in range(3)]) for _ in range(2)]
+        vector = PolyVec([self.random_poly(-4, 4) for _ in range(3)])
+        product = self.ntt.multiply_matrix_vector(matrix, vector)
+        self.assertEqual(product.domain, NTT_DOMAIN)
+        self.assertEqual(product, self.ntt.multiply_matrix_vector(matrix, self.ntt.NTT_vec(vector)))
+
+    def test_out_parameters(self):
+        vector = PolyVec([self.random_poly(-(1 << 19), 1 << 19) for _ in range(3)])
+        matrix = [self.ntt.NTT_vec([self.random_poly() for _ in range(3)]) for _ in range(2)]
+        c = [0] * 256
+        c[3], c[200] = 1, -1
+
+        out = PolyVec([Poly([0] * 256) for _ in range(3)])
+        buffers = list(out)
+        self.assertIs(self.ntt.NTT_vec(vector, out=out), out)
+        self.assertEqual(out, self.ntt.NTT_vec(vector))
+        self.assertEqual(out.domain, NTT_DOMAIN)
+
+        product = PolyVec([Poly([0] * 256) for _ in range(2)])
+        self.assertEqual(self.ntt.multiply_matrix_vector(matrix, out, out=product), self.ntt.multiply_matrix_vector(matrix, out))
+
+        # in place: the output aliases the input.
+        self.ntt.inv_NTT_vec(out, out=out)
+        self.assertEqual(out, [[x % self.q for x in p] for p in vector])
+        self.assertEqual(out.domain, COEFFICIENT_DOMAIN)
+        expected = self.ntt.SubPolynomialVectors(out, self.ntt.sparse_multiply_vector(c, out))
+        self.ntt.SubPolynomialVectors(out, self.ntt.sparse_multiply_vector(c, out, out=PolyVec(vector)), out=out)
+        self.assertEqual(out, expected)
+        self.assertTrue(all(a is b for a, b in zip(out, buffers)))
+
+        self.assertRaises(ValueError, self.ntt.AddPolynomialVectors, vector, vector, out=PolyVec(vector[:2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
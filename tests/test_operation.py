@@ -0,0 +1,102 @@
+import unittest
+import random
+from fips.mldsa.operation import Operations
+from fips.mldsa.packing import Packing
+from fips.mldsa.conversion import Conversion
+from fips.mldsa.poly import PolyVec, hint_indices
+
+
+class TestOperations(unittest.TestCase):
+    """
+    Test the vector decompositions against the per-coefficient algorithms.
+    """
+
+    def setUp(self):
+        self.q = 8380417
+        self.r = [[random.randint(0, self.q - 1) for _ in range(256)] for _ in range(4)]
+        # the coefficients around the multiples of 2*gamma2 and q - 1, where Decompose wraps.
+        self.r[0][:6] = [0, 1, self.q - 1, self.q - 2, self.q - 95232, self.q - 261888]
+
+    def for_each_gamma2(self, check):
+        for gamma2 in ((self.q - 1) // 88, (self.q - 1) // 32):
+            for use_numpy in (False, True):
+                with self.subTest(gamma2=gamma2, use_numpy=use_numpy):
+                    check(Operations(gamma2, use_numpy=use_numpy))
+
+    def test_decompose_vec(self):
+        def check(operation):
+            r1, r0 = operation.decompose_vec(self.r)
+            self.assertEqual(r1, [[operation.highBits(x) for x in p] for p in self.r])
+            self.assertEqual(r0, [[operation.lowBits(x) for x in p] for p in self.r])
+            self.assertEqual(operation.highbits_vec(self.r), r1)
+            self.assertEqual(operation.lowbits_vec(self.r), r0)
+            self.assertEqual(operation.lowBits_polynomial(self.r[1]), r0[1])
+        self.for_each_gamma2(check)
+
+    def test_use_hint_vec(self):
+        h = [[int(random.random() < 0.1) for _ in range(256)] for _ in range(4)]
+        def check(operation):
+            self.assertEqual(operation.use_hint_vec(h, self.r),
+                [[operation.use_hint(b, x) for b, x in zip(hp, rp)] for hp, rp in zip(h, self.r)])
+        self.for_each_gamma2(check)
+
+    def test_make_hint_vec(self):
+        z = [[random.randint(-300000, 300000) for _ in range(256)] for _ in range(4)]
+        def check(operation):
+            h = operation.make_hint_vec(z, self.r)
+            self.assertEqual([[(bits >> j) & 1 for j in range(256)] for bits in h],
+                [[int(operation.make_hint(a, b)) for a, b in zip(zp, rp)] for zp, rp in zip(z, self.r)])
+            self.assertEqual(operation.use_hint_vec(h, self.r),
+                operation.use_hint_vec([[(bits >> j) & 1 for j in range(256)] for bits in h], self.r))
+        self.for_each_gamma2(check)
+
+    def test_make_hint_low_bits_vec(self):
+        beta = 78
+        def check(operation):
+            gamma2 = operation.gamma2
+            top = (self.q - 1) // (2 * gamma2)
+            w1 = [[random.randrange(top) for _ in range(256)] for _ in range(4)]
+            w0 = [[random.randint(-gamma2 + beta + 1, gamma2 - beta - 1) for _ in range(256)] for _ in range(4)]
+            w0[0][:4] = [-gamma2 + beta + 1, -gamma2 + beta + 1, gamma2 - beta - 1, 0]
+            w1[0][:4] = [0, 1, top - 1, 0]
+            c_s2 = [[random.randint(-beta, beta) for _ in range(256)] for _ in range(4)]
+            c_t0 = [[random.randint(-gamma2 + 1, gamma2 - 1) for _ in range(256)] for _ in range(4)]
+            w = [[(a * 2 * gamma2 + b) % self.q for a, b in zip(p1, p0)] for p1, p0 in zip(w1, w0)]
+
+            a0 = [[b - s + t for b, s, t in zip(*polys)] for polys in zip(w0, c_s2, c_t0)]
+            r = [[x - s + t for x, s, t in zip(*polys)] for polys in zip(w, c_s2, c_t0)]
+            self.assertEqual(operation.decompose_vec(w), (w1, w0))
+            self.assertEqual(operation.make_hint_low_bits_vec(a0, w1),
+                operation.make_hint_vec([[-t for t in p] for p in c_t0], r))
+        self.for_each_gamma2(check)
+
+    def test_hint_bitsets(self):
+        packing = Packing(omega=80, k=4)
+        h = [0, (1 << 255) | (1 << 3) | 1, 0, 1 << 128]
+        h_lists = [[(bits >> j) & 1 for j in range(256)] for bits in h]
+        self.assertEqual(hint_indices(h[1]), [0, 3, 255])
+        self.assertEqual(hint_indices(h_lists[1]), [0, 3, 255])
+        self.assertEqual(Conversion().calc_ones(h), 4)
+        self.assertEqual(Conversion().calc_ones(h_lists), 4)
+
+        packed = packing.hint_bit_pack(h)
+        self.assertEqual(packed, packing.hint_bit_pack(h_lists))
+        self.assertEqual(packing.hint_bit_unpack(packed), h)
+        self.assertRaises(ValueError, packing.hint_bit_pack, [0, 1 << 256, 0, 0])
+        self.assertRaises(ValueError, Packing(omega=3, k=4).hint_bit_pack, h)
+
+    def test_out_parameter(self):
+        operation = Operations(261888)
+        out = PolyVec(self.r)
+        first = out[0]
+        self.assertIs(operation.lowbits_vec(out, out=out), out)
+        self.assertIs(out[0], first)
+        self.assertEqual(out, operation.decompose_vec(self.r)[1])
+
+        high, low = PolyVec(self.r), PolyVec(self.r)
+        self.assertEqual(operation.decompose_vec(high, out=(high, low)), operation.decompose_vec(self.r))
+        self.assertRaises(ValueError, operation.highbits_vec, self.r, PolyVec(self.r[:2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+import random
+import secrets
+from fips.mldsa.packing import Packing
+
+
+class TestPacking(unittest.TestCase):
+    """
+    Test the integer unpacking against the bit string definition of FIPS 204.
+    """
+
+    def setUp(self):
+        self.packing = Packing(omega=80, k=4)
+
+    def test_unpack_matches_bit_strings(self):
+        convert = self.packing.convert
+        for c in (3, 4, 6, 10, 13, 18, 20):
+            v = secrets.token_bytes(32 * c)
+            bits = convert.bytes_to_bits(v)
+            expected = [convert.bits_to_integer(bits[i * c:(i + 1) * c], c) for i in range(256)]
+            self.assertEqual(self.packing.simple_bit_unpack(v, (1 << c) - 1), expected)
+            self.assertEqual(self.packing.bit_unpack(v, (1 << (c - 1)) - 1, 1 << (c - 1)),
+                [(1 << (c - 1)) - x for x in expected])
+
+    def test_gamma1_round_trip(self):
+        for gamma1 in (1 << 17, 1 << 19):
+            w = [random.randint(-gamma1 + 1, gamma1) for _ in range(256)]
+            self.assertEqual(self.packing.bit_unpack(self.packing.bit_pack(w, gamma1 - 1, gamma1), gamma1 - 1, gamma1), w)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from array import array
+import pickle
+import sys
+import secrets
+import threading
+from fips.mldsa import MLDSA_128, Poly, PolyVec, PolyMatrix
+from fips.mldsa.scratch import SignScratch
+
+
+class TestPoly(unittest.TestCase):
+    """
+    Test the array backed polynomial types.
+    """
+
+    def test_poly_behaves_like_a_list(self):
+        coefficients = [(-1) ** i * i * 32749 for i in range(256)]
+        poly = Poly(coefficients)
+        self.assertEqual(poly, coefficients)
+        self.assertEqual(coefficients, poly)
+        self.assertEqual(len(poly), 256)
+        self.assertEqual(poly[255], coefficients[255])
+        self.assertNotEqual(poly, coefficients[:-1])
+        self.assertFalse(hasattr(poly, "__dict__"))
+
+    def test_poly_is_compact(self):
+        coefficients = list(range(8000000, 8000256))
+        list_size = sys.getsizeof(coefficients) + sum(sys.getsizeof(x) for x in coefficients)
+        self.assertLess(4 * sys.getsizeof(Poly(coefficients)), list_size)
+
+    def test_pickle(self):
+        matrix = PolyMatrix([[list(range(256))] * 2] * 3)
+        restored = pickle.loads(pickle.dumps(matrix))
+        self.assertIsInstance(restored[2][1], Poly)
+        self.assertEqual(restored, matrix)
+
+    def test_samplers_return_compact_types(self):
+        A_hat = MLDSA_128.sample.expand_A(secrets.token_bytes(32))
+        s1, s2 = MLDSA_128.sample.expand_S(secrets.token_bytes(64))
+        self.assertIsInstance(A_hat, PolyMatrix)
+        self.assertIsInstance(A_hat[0], PolyVec)
+        self.assertIsInstance(A_hat[0][0], Poly)
+        self.assertIsInstance(s1[0], Poly)
+        self.assertIsInstance(MLDSA_128.ntt.NTT(s2[0]), Poly)
+
+    def test_assign_in_place(self):
+        poly = Poly([0] * 256)
+        poly.assign(range(256))
+        self.assertEqual(poly, list(range(256)))
+        self.assertRaises(ValueError, poly.assign, [1, 2])
+
+        # an iterator may read the coefficients it overwrites.
+        poly.assign(map((-1).__mul__, poly))
+        self.assertEqual(poly, [-x for x in range(256)])
+        poly.assign(array("i", range(256)))
+        self.assertEqual(poly, list(range(256)))
+        self.assertRaises(ValueError, poly.assign, iter(range(255)))
+        self.assertRaises(ValueError, poly.assign, iter(range(257)))
+
+    def test_sign_scratch_is_per_thread(self):
+        arena = SignScratch.for_thread(4, 4)
+        self.assertIs(SignScratch.for_thread(4, 4), arena)
+        self.assertIsNot(SignScratch.for_thread(6, 5), arena)
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(SignScratch.for_thread(4, 4)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], arena)
+        self.assertEqual(len(arena.w), 4)
+        self.assertEqual(len(arena.z[3]), 256)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import hashlib
+import random
+import secrets
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from fips.mldsa.sample import Sample
+from fips.mldsa.ntt import NTT
+from fips.mldsa.poly import SparsePoly
+
+
+class TestSample(unittest.TestCase):
+    """
+    Test the bulk samplers against the per-coefficient algorithms of FIPS 204.
+    """
+
+    def setUp(self):
+        self.samplers = [Sample(2, 1 << 17, 4, 4, 128, 39, 80, use_numpy=use_numpy) for use_numpy in (False, True)]
+
+    def test_rej_ntt_poly(self):
+        sample = self.samplers[0]
+        for _ in range(10):
+            rho = secrets.token_bytes(34)
+            stream = hashlib.shake_128(rho).digest(3 * 1024)
+            expected = []
+            for i in range(0, len(stream), 3):
+                z = sample.CoeffFromThreeBytes(stream[i], stream[i + 1], stream[i + 2])
+                if z is not None and len(expected) < 256:
+                    expected.append(z)
+            for sampler in self.samplers:
+                self.assertEqual(sampler.RejNTTPoly(rho), expected)
+
+    def test_expand_a_on_executor(self):
+        sample = Sample(2, 1 << 17, 6, 5, 128, 39, 80)
+        rho = secrets.token_bytes(32)
+        expected = sample.expand_A(rho)
+        for executor_type in (ThreadPoolExecutor, ProcessPoolExecutor):
+            with executor_type(2) as executor:
+                A = sample.expand_A(rho, executor)
+            self.assertEqual(A, expected)
+            self.assertEqual(A.domain, expected.domain)
+
+    def test_expand_a_streamed(self):
+        sample = Sample(2, 1 << 17, 6, 5, 128, 39, 80)
+        rho = secrets.token_bytes(32)
+        A = sample.expand_A_streamed(rho)
+        self.assertEqual((len(A), A.l, A.domain), (6, 5, sample.expand_A(rho).domain))
+        self.assertEqual(list(A), sample.expand_A(rho))
+        self.assertEqual(list(A), list(A))
+        self.assertEqual(NTT().multiply_matrix_vector(A, sample.expand_A(rho)[0]),
+            NTT().multiply_matrix_vector(sample.expand_A(rho), sample.expand_A(rho)[0]))
+
+    def test_expand_a_rho_length(self):
+        sample = self.samplers[0]
+        for rho in (bytes(31), bytes(33), "x" * 32):
+            self.assertRaises(ValueError, sample.expand_A, rho)
+            self.assertRaises(ValueError, sample.expand_A_streamed, rho)
+
+    def test_rej_bounded_poly(self):
+        for eta in (2, 4):
+            sample = Sample(eta, 1 << 19, 6, 5, 192, 49, 55)
+            for _ in range(10):
+                rho = secrets.token_bytes(66)
+                expected = []
+                for z in hashlib.shake_256(rho).digest(1024):
+                    for half in (z % 16, z // 16):
+                        coefficient = sample.CoeffFromHalfByte(half)
+                        if coefficient is not None and len(expected) < 256:
+                            expected.append(coefficient)
+                self.assertEqual(sample.RejBoundedPoly(rho), expected)
+
+    def test_challenge(self):
+        sample = Sample(4, 1 << 19, 6, 5, 192, 49, 55)
+        for _ in range(10):
+            rho = secrets.token_bytes(48)
+            stream = hashlib.shake_256(rho).digest(1024)
+            h = sample.convert.bytes_to_bits(stream[:8])
+            expected = [0] * 256
+            position = 8
+            for i in range(256 - 49, 256):
+                j = stream[position]
+                position += 1
+                while j > i:
+                    j = stream[position]
+                    position += 1
+                expected[i] = expected[j]
+                expected[j] = -1 if h[i + 49 - 256] == "1" else 1
+
+            c, c_sparse = sample.challenge(rho)
+            self.assertEqual(c, expected)
+            self.assertEqual(sample.SampleInBall(rho), expected)
+            self.assertIsInstance(c_sparse, SparsePoly)
+            self.assertEqual(len(c_sparse.positions), 49)
+            self.assertEqual([c[i] for i in c_sparse.positions], list(c_sparse.signs))
+
+            poly = [random.randrange(8380417) for _ in range(256)]
+            self.assertEqual(NTT().sparse_multiply(c_sparse, poly), NTT().sparse_multiply(c, poly))
+
+    def test_coefficients_from_three_bytes(self):
+        # 0x7FFFFF and q (with the ignored top bit set) are rejected, q - 1 is accepted.
+        buffer = bytes([0xFF, 0xFF, 0x7F, 0x01, 0xE0, 0xFF, 0x00, 0xE0, 0x7F, 0x01, 0x02, 0x83])
+        for sampler in self.samplers:
+            self.assertEqual(sampler._coefficients_from_three_bytes(buffer), [8380416, 0x030201])
+
+
+if __name__ == "__main__":
+    unittest.main()
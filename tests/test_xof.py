@@ -0,0 +1,40 @@
+import unittest
+import hashlib
+import secrets
+from fips.mldsa.xof import XOFReader
+
+
+class TestXOFReader(unittest.TestCase):
+    """
+    Test that the reader serves the continuous SHAKE output stream.
+    """
+
+    def test_reads_continue_the_stream(self):
+        data = secrets.token_bytes(34)
+        reader = XOFReader.shake_128(data, 3)
+        parts = [reader.read(n) for n in (3, 165, 1, 500, 2000)]
+        self.assertEqual(b"".join(parts), hashlib.shake_128(data).digest(2669))
+
+    def test_iteration_and_reads_share_the_cursor(self):
+        data = secrets.token_bytes(66)
+        reader = XOFReader.shake_256(data)
+        stream = hashlib.shake_256(data).digest(1000)
+
+        self.assertEqual(reader.read(8), stream[:8])
+        it = iter(reader)
+        self.assertEqual([next(it) for _ in range(300)], list(stream[8:308]))
+        self.assertEqual(reader.read(10), stream[308:318])
+        self.assertEqual(next(it), stream[318])
+
+    def test_squeezes_whole_blocks_geometrically(self):
+        reader = XOFReader.shake_256(b"", 1)
+        self.assertEqual(len(reader._buffer), 136)
+        reader.read(137)
+        self.assertEqual(len(reader._buffer), 272)
+        reader.read(1000)
+        self.assertEqual(len(reader._buffer) % 136, 0)
+        self.assertGreaterEqual(len(reader._buffer), 1137)
+
+
+if __name__ == "__main__":
+    unittest.main()